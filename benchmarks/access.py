@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Access microbenchmark: measures time of reading existing and nonexistent properties and sections
+by dot notation and with get() method, with and without exceptions option.
+
+Usage: python benchmarks/access.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from liteconfig import Config  # noqa: E402
+
+LINES = ['name = value', '[section]', 'key = value', 'number = 42']
+
+CASES = [
+    ('root property hit', 'cfg.name', {}),
+    ('section property hit', 'section.key', {}),
+    ('lazy section property hit', 'section.number', {'lazy': True}),
+    ('section property miss', 'section.missing', {}),
+    ('section miss', 'cfg.missing', {}),
+    ('section miss, exceptions', 'getattr(cfg, "missing", None)', {'exceptions': True}),
+    ('section property miss, exceptions', 'getattr(section, "missing", None)', {'exceptions': True}),
+    ('get() hit', 'cfg.get("section", "key")', {}),
+    ('get() miss', 'cfg.get("section", "missing")', {}),
+]
+
+
+def main():
+    number = 200000
+    print(f'{"case":<36} {"ns per access":>14}')
+    for name, statement, options in CASES:
+        cfg = Config(LINES, **options)
+        namespace = {'cfg': cfg, 'section': cfg.section}
+        elapsed = min(timeit.repeat(statement, globals=namespace, number=number, repeat=5))
+        print(f'{name:<36} {elapsed / number * 1e9:>14.0f}')
+
+
+if __name__ == '__main__':
+    main()
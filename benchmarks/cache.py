@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Cache benchmark: compares cold parse of config file with loading it from on-disk cache snapshot.
+
+Usage: python benchmarks/cache.py
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from liteconfig import Config  # noqa: E402
+from parser_scaling import make_config  # noqa: E402
+
+
+def main():
+    print(f'{"lines":>8} {"parse, s":>10} {"cache hit, s":>14} {"speedup":>8}')
+    with tempfile.TemporaryDirectory() as directory:
+        for line_count in (1000, 10000, 100000):
+            config_file = os.path.join(directory, f'{line_count}.ini')
+            with open(config_file, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(make_config(line_count)))
+            Config(config_file, cache=directory)  # warm up cache
+            runs = max(1, 100000 // line_count)
+            parse = min(timeit.repeat(lambda: Config(config_file), number=runs, repeat=3)) / runs
+            hit = min(timeit.repeat(lambda: Config(config_file, cache=directory), number=runs, repeat=3)) / runs
+            print(f'{line_count:>8} {parse:>10.4f} {hit:>14.4f} {parse / hit:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
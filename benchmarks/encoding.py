@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Encoding detection benchmark: compares loading config file with explicit encoding and with encoding='auto',
+for UTF-8 and KOI8-R files with Cyrillic values (KOI8-R one is detected after failed UTF-8 decode).
+
+Usage: python benchmarks/encoding.py
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from liteconfig import Config  # noqa: E402
+from parser_scaling import make_config  # noqa: E402
+
+
+def main():
+    print(f'{"encoding":>9} {"lines":>8} {"explicit, s":>12} {"auto, s":>10} {"overhead":>9}')
+    with tempfile.TemporaryDirectory() as directory:
+        for encoding in ('utf-8', 'koi8_r'):
+            for line_count in (10000, 100000, 1000000):
+                config_file = os.path.join(directory, f'{encoding}-{line_count}.ini')
+                with open(config_file, 'w', encoding=encoding) as f:
+                    f.write('\n'.join(make_config(line_count)).replace('value', 'значение'))
+                runs = max(1, 100000 // line_count)
+                explicit, auto = [
+                    min(timeit.repeat(lambda: Config(config_file, **options), number=runs, repeat=3)) / runs
+                    for options in ({'encoding': encoding}, {'encoding': 'auto', 'fallback_encodings': ('koi8_r',)})
+                ]
+                print(f'{encoding:>9} {line_count:>8} {explicit:>12.4f} {auto:>10.4f} {auto / explicit - 1:>+9.1%}')
+
+
+if __name__ == '__main__':
+    main()
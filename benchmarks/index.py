@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Section index benchmark: compares full parse of config file with indexed load reading a single section,
+with offsets of sections scanned on every load, or read from sidecar index file.
+
+Usage: python benchmarks/index.py
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from liteconfig import Config  # noqa: E402
+from parser_scaling import make_config  # noqa: E402
+
+
+def main():
+    print(f'{"lines":>8} {"parse, s":>10} {"index, s":>10} {"sidecar, s":>11} {"speedup":>8}')
+    with tempfile.TemporaryDirectory() as directory:
+        for line_count in (10000, 100000, 1000000):
+            config_file = os.path.join(directory, f'{line_count}.ini')
+            lines = make_config(line_count)
+            with open(config_file, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines))
+            section = next(x for x in reversed(lines) if x.startswith('['))[1:-1]
+            Config(config_file, index=True, cache=directory)  # warm up sidecar index
+            runs = max(1, 100000 // line_count)
+            timings = [
+                min(timeit.repeat(lambda: getattr(Config(config_file, **options), section),
+                                  number=runs, repeat=3)) / runs
+                for options in ({}, {'index': True}, {'index': True, 'cache': directory})
+            ]
+            print(f'{line_count:>8} {timings[0]:>10.4f} {timings[1]:>10.4f} {timings[2]:>11.4f} '
+                  f'{timings[0] / timings[2]:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Memory-mapped parsing benchmark: compares loading config file line by line (eager and lazy)
+with scanning its memory-mapped bytes.
+
+Usage: python benchmarks/mapped.py
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from liteconfig import Config  # noqa: E402
+from parser_scaling import make_config  # noqa: E402
+
+
+def main():
+    print(f'{"lines":>8} {"eager, s":>10} {"lazy, s":>10} {"mmap, s":>10}')
+    with tempfile.TemporaryDirectory() as directory:
+        for line_count in (10000, 100000, 1000000):
+            config_file = os.path.join(directory, f'{line_count}.ini')
+            with open(config_file, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(make_config(line_count)))
+            runs = max(1, 100000 // line_count)
+            timings = [
+                min(timeit.repeat(lambda: Config(config_file, **options), number=runs, repeat=3)) / runs
+                for options in ({}, {'lazy': True}, {'mmap': True})
+            ]
+            print(f'{line_count:>8} ' + ' '.join(f'{x:>10.4f}' for x in timings))
+
+
+if __name__ == '__main__':
+    main()
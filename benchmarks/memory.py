@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Memory benchmark: measures memory taken by parsed configs with thousands of sections.
+Raw config lines are allocated before measurement, so only parsed data structures are counted.
+
+Usage: python benchmarks/memory.py
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from liteconfig import Config  # noqa: E402
+
+
+def make_config(section_count, section_size=5, comment_every=4):
+    """Returns list of config lines with section_count sections, commented every comment_every properties."""
+    lines = []
+    for section in range(section_count):
+        lines.append(f'[section{section}]')
+        for i in range(section_size):
+            if i % comment_every == 0:
+                lines.append('; comment')
+            lines.append(f'key{i} = value{i}')
+    return lines
+
+
+def measure(lines, **options):
+    """Returns number of bytes allocated by Config parsing lines and kept after parsing."""
+    gc.collect()
+    tracemalloc.start()
+    cfg = Config(lines, **options)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del cfg
+    return size
+
+
+def main():
+    print(f'{"sections":>9} {"total, KiB":>11} {"per section, B":>15} {"lazy, KiB":>10}')
+    for section_count in (1000, 5000, 20000):
+        lines = make_config(section_count)
+        total = measure(lines)
+        lazy = measure(lines, lazy=True)
+        print(f'{section_count:>9} {total / 1024:>11.0f} {total / section_count:>15.0f} {lazy / 1024:>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Parser scaling benchmark: parses synthetic configs of 1k, 10k and 100k lines
+and prints time per line, which should stay roughly constant as config grows.
+Lazy column shows cold start time when values are converted on first access.
+
+Usage: python benchmarks/parser_scaling.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from liteconfig import Config  # noqa: E402
+
+
+def make_config(line_count, section_size=20):
+    """Returns list of config lines: sections with comments, strings, numbers and booleans."""
+    lines = []
+    section = 0
+    while len(lines) < line_count:
+        lines.append(f'[section{section}]')
+        lines.append('; comment')
+        for i in range(section_size):
+            lines.append(f'key{i} = {(i, "value", "yes", 3.14)[i % 4]}')
+        lines.append('')
+        section += 1
+    return lines[:line_count]
+
+
+def main():
+    print(f'{"lines":>8} {"total, s":>10} {"per line, us":>14} {"lazy, s":>10}')
+    for line_count in (1000, 10000, 100000):
+        lines = make_config(line_count)
+        runs = max(1, 100000 // line_count)
+        total = min(timeit.repeat(lambda: Config(lines), number=runs, repeat=3)) / runs
+        lazy = min(timeit.repeat(lambda: Config(lines, lazy=True), number=runs, repeat=3)) / runs
+        print(f'{line_count:>8} {total:>10.4f} {total / line_count * 1e6:>14.3f} {lazy:>10.4f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Query benchmark: compares filtering all sections and properties by glob patterns with query(),
+on its first call (building indexes) and on repeated calls (hitting its result cache).
+
+Usage: python benchmarks/query.py
+"""
+
+import os
+import sys
+import timeit
+from fnmatch import fnmatchcase
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from liteconfig import Config  # noqa: E402
+from parser_scaling import make_config  # noqa: E402
+
+
+def scan(cfg, section_pattern, key_pattern):
+    """Returns the same as query(), walking all sections and properties."""
+    return [(name, key, cfg.get(name, key)) for name in cfg._Config__sections if fnmatchcase(name, section_pattern)
+            for key in cfg._section(name) if fnmatchcase(key, key_pattern)]
+
+
+def main():
+    patterns = ('section1*', 'key1?')
+    print(f'{"lines":>8} {"scan, s":>10} {"first, s":>10} {"cached, s":>10} {"speedup":>8}')
+    for line_count in (10000, 100000, 1000000):
+        cfg = Config(make_config(line_count))
+
+        def first():
+            cfg._publish(cfg._Config__root)  # publishing state drops indexes and cache of query
+            return cfg.query(*patterns)
+
+        runs = max(1, 100000 // line_count)
+        scanned = min(timeit.repeat(lambda: scan(cfg, *patterns), number=runs, repeat=3)) / runs
+        first_query = min(timeit.repeat(first, number=runs, repeat=3)) / runs
+        cached = min(timeit.repeat(lambda: cfg.query(*patterns), number=1000, repeat=3)) / 1000
+        assert set(cfg.query(*patterns)) == set(scan(cfg, *patterns))
+        print(f'{line_count:>8} {scanned:>10.4f} {first_query:>10.4f} {cached:>10.6f} {scanned / cached:>8.0f}')
+
+
+if __name__ == '__main__':
+    main()
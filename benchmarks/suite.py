@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark suite: measures parsing, attribute access, has_property() and write() on synthetic configs
+of various shapes, reports throughput and peak memory, and compares parsing and access with stdlib configparser.
+
+Results may be saved as baseline JSON, and later runs compared against it: every throughput which dropped
+(or peak memory which grew) by more than threshold (20% by default) is reported as regression,
+and script exits with status 1.
+Baseline is specific to machine and Python version it was recorded on, and timings are only comparable
+if machine is otherwise idle, so rerun suspicious cases before bisecting regressions.
+
+Usage:
+    python benchmarks/suite.py [--quick] [--save baseline.json] [--compare baseline.json] [--threshold 0.2]
+"""
+
+import argparse
+import configparser
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from liteconfig import Config  # noqa: E402
+
+VALUES = {
+    'string': lambda i: f'value{i}',
+    'number': lambda i: str(i * 7),
+    'float': lambda i: f'{i}.25',
+    'boolean': lambda i: ('yes', 'no', 'true', 'off')[i % 4],
+    'unicode': lambda i: f'значение {i} ✓',
+}
+
+# name -> generator parameters
+CASES = {
+    'small': dict(line_count=1000, section_size=20),
+    'large': dict(line_count=100000, section_size=20),
+    'many-sections': dict(line_count=100000, section_size=3),
+    'few-sections': dict(line_count=100000, section_size=5000),
+    'strings': dict(line_count=50000, section_size=20, value_types=('string',)),
+    'numbers': dict(line_count=50000, section_size=20, value_types=('number', 'float')),
+    'booleans': dict(line_count=50000, section_size=20, value_types=('boolean',)),
+    'commented': dict(line_count=50000, section_size=20, comment_every=1),
+    'unicode': dict(line_count=50000, section_size=20, value_types=('unicode',), unicode_keys=True),
+}
+
+QUICK_CASES = ('small', 'strings', 'unicode')
+
+
+def generate(line_count, section_size=20, value_types=tuple(VALUES), comment_every=5, unicode_keys=False):
+    """
+    Returns list of config lines: sections of section_size properties, with values of value_types in turn
+    and comment line before every comment_every-th property (0 for no comments).
+    """
+    lines = []
+    section = 0
+    key = 'ключ' if unicode_keys else 'key'
+    while len(lines) < line_count:
+        lines.append(f'[section{section}]')
+        for i in range(section_size):
+            if comment_every and i % comment_every == 0:
+                lines.append(f'; comment {i}')
+            lines.append(f'{key}{i} = {VALUES[value_types[i % len(value_types)]](i)}')
+        section += 1
+    return lines[:line_count]
+
+
+def best(function, repeat=3):
+    """Returns best time of function run in seconds, each measurement taking at least 0.2 seconds."""
+    timer = timeit.Timer(function)
+    number = timer.autorange()[0]
+    return min(timer.repeat(repeat, number)) / number
+
+
+def peak_memory(function):
+    """Returns peak number of bytes allocated while function runs."""
+    gc.collect()
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def run_case(lines):
+    """Returns dict of metric -> value for config lines: throughputs (per second) and peak memory (bytes)."""
+    text = '\n'.join(lines)
+    cfg = Config(lines)
+    sections = [name for name in cfg._Config__sections]
+    keys = [(cfg._section(name), list(cfg._section(name))) for name in sections]
+    property_count = sum(len(section_keys) for _, section_keys in keys)
+    probes = [key for _, section_keys in keys[:1] for key in section_keys] + ['nonexistent']
+
+    def access():
+        for section, section_keys in keys:
+            for key in section_keys:
+                getattr(section, key)
+
+    def has_property():
+        for _ in range(1000):
+            for key in probes:
+                cfg.has_property(key)
+
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.read_string(text)
+    parser_keys = [(parser[name], list(parser[name])) for name in parser.sections()]
+
+    def configparser_parse():
+        configparser.ConfigParser(interpolation=None).read_string(text)
+
+    def configparser_access():
+        for section, section_keys in parser_keys:
+            for key in section_keys:
+                section[key]
+
+    return {
+        'parse, lines/s': len(lines) / best(lambda: Config(lines)),
+        'lazy parse, lines/s': len(lines) / best(lambda: Config(lines, lazy=True)),
+        'access, properties/s': property_count / best(access),
+        'has_property, calls/s': 1000 * len(probes) / best(has_property),
+        'write, lines/s': len(lines) / best(lambda: cfg.write(io.StringIO())),
+        'parse peak memory, bytes': peak_memory(lambda: Config(lines)),
+        'configparser parse, lines/s': len(lines) / best(configparser_parse),
+        'configparser access, properties/s': property_count / best(configparser_access),
+        'configparser parse peak memory, bytes': peak_memory(configparser_parse),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Returns list of regression descriptions: throughput dropped or memory grew by more than threshold."""
+    regressions = []
+    for case, metrics in results.items():
+        for metric, value in metrics.items():
+            old = baseline.get('results', {}).get(case, {}).get(metric)
+            if not old or metric.startswith('configparser'):
+                continue
+            change = value / old - 1
+            if metric.endswith('bytes') and change > threshold or not metric.endswith('bytes') and change < -threshold:
+                regressions.append(f'{case}: {metric} {old:,.0f} -> {value:,.0f} ({change:+.0%})')
+    return regressions
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    arguments.add_argument('--quick', action='store_true', help='run only small cases')
+    arguments.add_argument('--save', metavar='FILE', help='save results as baseline JSON')
+    arguments.add_argument('--compare', metavar='FILE', help='compare results with baseline JSON')
+    arguments.add_argument('--threshold', type=float, default=0.2, help='relative change reported as regression')
+    options = arguments.parse_args()
+
+    results = {}
+    for case in QUICK_CASES if options.quick else CASES:
+        results[case] = metrics = run_case(generate(**CASES[case]))
+        print(f'{case} ({CASES[case]["line_count"]} lines)')
+        for metric, value in metrics.items():
+            print(f'    {metric:<40} {value:>16,.0f}')
+        print(f'    {"parse speedup over configparser":<40} '
+              f'{metrics["parse, lines/s"] / metrics["configparser parse, lines/s"]:>16.1f}')
+
+    if options.save:
+        with open(options.save, 'w', encoding='utf-8') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(), 'results': results},
+                      f, indent=2)
+    if options.compare:
+        with open(options.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), options.threshold)
+        for regression in regressions:
+            print('REGRESSION', regression)
+        if regressions:
+            sys.exit(1)
+        print('No regressions')
+
+
+if __name__ == '__main__':
+    main()
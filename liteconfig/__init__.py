@@ -1 +1 @@
-from liteconfig.liteconfig import Config
+from liteconfig.liteconfig import Changeset, Config, Field, InterpolationError, LoadError, SchemaError, Stats
@@ -8,7 +8,7 @@ Features:
     - dot notation (value = cfg.section.property);
     - customizable parsing options;
     - no dependencies inside, only plain Python;
-    - can handle text files, multiline strings or lists as input data;
+    - can handle text files, file objects, multiline strings, lists or iterators of lines as input data;
     - no singleton, you can use as much Config objects as you want;
     - multiple encodings support, including Unicode;
     - read/write config files.
@@ -22,6 +22,9 @@ Default parsing options and their meaning:
       String which will follow up delimiter character when exporting config to file.
     - comment_markers = '#;'
       Empty lines and lines beginning with "#" or ";" are ignored.
+    - hierarchy = None
+      Sections are flat. If set to 'dotted', section [a.b.c] is available as cfg.a.b.c, and section inherits
+      properties of its parent sections as defaults (cfg.a.b.c.x is cfg.a.x, unless redefined in [a.b] or [a.b.c]).
     - parse_numbers = True
       Will try to parse numeric values to int or float.
     - parse_booleans = True
@@ -31,7 +34,40 @@ Default parsing options and their meaning:
     - boolean_false = ('no', 'false', 'off')
       Case-insensitive tuple of string values, recognized as boolean "False".
     - encoding = 'utf-8'
-      Parser will try to read and write config files using this encoding.
+      Parser will try to read and write config files using this encoding. If 'auto', encoding of config file
+      is detected: by byte order mark, else UTF-8 if file is valid UTF-8, else the first of fallback_encodings
+      which decodes it. Detected encoding is used to write config back.
+    - fallback_encodings = ('latin-1',)
+      Encodings tried in order by encoding='auto', if config file is not UTF-8.
+    - converters = ()
+      Additional value converters, tried in order after booleans and numbers parsing. Converter receives
+      string value and returns either converted value or the very same string object.
+    - lazy = False
+      If True, values are kept as strings at load time and converted on first access, then cached.
+    - cache = None
+      If set, parsed config file is snapshotted on disk and next loads of unchanged file (same modification time,
+      size and content hash) skip parsing. True puts cache next to config file, string is a path to cache directory.
+    - mmap = False
+      If True, config file is memory-mapped and scanned as bytes: only keys are decoded at load time,
+      values are decoded (with encoding option) and converted on first access. Implies lazy.
+    - stats = None
+      If set, timings of loading phases, counts of lines, sections and properties, and calls of converters
+      are collected into Stats object returned by stats(). Callable is called with it after every load and reload.
+    - track_access = False
+      If True, accesses to every property are counted in Stats object, to find unused ones. Implies stats.
+    - schema = None
+      Declaration of types, defaults and constraints of properties: mapping of section name (None for no-section
+      part) -> {property name -> Field(type, default, required, min, max, choices) or just type}, or class with
+      annotated attributes (required unless they have default value) and nested classes for sections.
+      Schema is compiled once, declared properties are converted and checked while parsing, other ones as usual.
+    - interpolation = False
+      If True, ${section.property} in value is replaced with text of that property (${property} for no-section
+      part of config), $$ stands for "$". References are resolved once, at load time, in order of their dependency
+      graph, and set() resolves again only properties depending on changed one.
+    - index = False
+      If True, config file is scanned once for byte offsets of section headers, without decoding it, and only
+      no-section part is parsed at load time. Each section is parsed on first access to it. With cache option,
+      offsets are kept in sidecar index file. Has no effect with hierarchy, schema or interpolation.
     - exceptions = False
       If True, accessing nonexistent properties (or sections) of config will raise AttributeError.
       If False, nonexistent property will return None. Absent section will return special object Nothing,
@@ -45,22 +81,84 @@ Public methods of Config object:
     - __init__(input_data [, delimiter, comment_markers, parse_numbers, parse_booleans,
       boolean_true, boolean_false, encoding, exceptions]):
       Instantiates Config object and parses input_data. Depending on type of input_data,
-      instance will parse it as list, as multiline string or will interpret string as path to
-      config file and read it.
+      instance will parse it as list, as multiline string, will interpret string as path to
+      config file and read it, or will stream lines from file object or iterator.
     - has_section(item):
       Return True or False depending on existence of config section.
     - has_property(item [, section]):
       Return True or False depending on existence of config property. Will search in all sections
       by default or in one concrete section if it is passed as second argument.
+    - get(section, key [, default]):
+      Return value of property of section (None for no-section part), or default (None) if it is absent.
+      Never raises AttributeError and is faster than getattr() with default for probing optional properties.
+    - sections_with(item):
+      Return list of sections which define property; None in the list stands for no-section part of config.
     - write(file):
-      Export config to file with the same settings as when object was instantiated.
+      Export config to file with the same settings as when object was instantiated. File may be path to file,
+      which is replaced atomically, or writable text or binary stream (including io.StringIO and io.BytesIO).
+    - stats():
+      Return Stats object with instrumentation data (timings, counts, conversions, access), or None if disabled.
+    - reload():
+      Re-read config file if it was modified, parsing again only sections which text has changed.
+      Return set of changed keys ("section.property", or "property" for no-section part of config).
+    - watch([callback, interval]):
+      Start background thread polling config file every interval seconds (1 by default) and reloading it.
+      Callback is called with set of changed keys after every reload which changes something.
+    - unwatch():
+      Stop watching config file.
+    - snapshot():
+      Return Config object sharing current state of this one, which is not affected by later reloads.
+    - await Config.aload(input_data [, executor, parsing options]):
+      Create Config object in executor (default one of event loop), so file reading and parsing don't block it.
+    - await areload([executor]), await awrite(file [, executor]):
+      Run reload() or write() in executor.
+    - async for changed_keys in changes([interval, executor]):
+      Poll config file every interval seconds (1 by default), reload it in executor, yield sets of changed keys.
+    - Config.layered(sources [, workers, parsing options]):
+      Create Config merging list of sources (paths, strings, lists...), later ones overriding earlier ones.
+      Sources are parsed in parallel threads, overrides are resolved once, at load time.
+    - Config.load_many(paths [, workers, processes, parsing options]):
+      Load list of config files (or files matching glob pattern) in pool of threads or processes.
+      Return dict of path -> Config object.
+    - provenance(item [, section]):
+      Return source which property of layered config comes from: path to file or position of source in list.
+    - to_dict():
+      Return converted properties as dict of section -> dict of properties (nested for dotted hierarchy).
+    - query([section_pattern, key_pattern]):
+      Return list of (section, key, value) of properties matching glob patterns, like query('db.*', '*_timeout').
+      Results are cached until config changes.
+    - set(section, key, value):
+      Set property of section (None for no-section part), string value is converted as parsed one.
+      Properties referencing it are resolved again. Return set of changed keys.
+    - Config.from_dict(data [, parsing options]):
+      Create Config from dict in to_dict() format, without parsing text. Values are taken as is.
+    - diff(other):
+      Return Changeset turning this config into other one. Shared and unchanged sections are skipped by digest.
+    - apply(changeset):
+      Apply Changeset made by diff(), keeping comments and order of properties. Return set of changed keys.
+    Config objects (and sections) can be pickled and copied; unpickled config can still be reloaded.
+
+Thread safety:
+    - Config object can be shared between threads and read without any locking.
+    - Each section is a read-only ConfigSection object. Holding a reference to it gives a consistent view
+      of its properties. Use snapshot() to get a consistent view of whole config.
+    - reload() builds new state aside, reusing unchanged sections, and publishes it by a single atomic
+      replacement of instance __dict__. Readers see either old or new state, never a mix of them.
+    - In lazy mode, conversion results are cached in place. This is the only mutation of published state, and it is
+      idempotent, so concurrent readers converting the same value get equal results.
+    - Sections of indexed config file are parsed on first access under lock, and added to published state in place.
 
 Error handling:
     - Attempt to load nonexistent config file will raise FileNotFoundError.
     - Also may raise PermissionError if process does not have sufficient privileges to read or write file.
     - If desired, access to nonexistent property (or section) will raise AttributeError.
-    - If input_data is not list nor string nor path to config file, will raise ValueError.
-    - Fail to decode input_data file will result in UnicodeError.
+    - Calling reload(), watch() or changes() on config which was not loaded from file will raise ValueError.
+    - Config.load_many() raises LoadError listing all files which failed to load, after loading the others.
+    - Unsupported hierarchy type will raise NotImplementedError.
+    - Config not conforming to schema will raise SchemaError (subclass of ValueError) listing all errors found.
+    - References to absent properties and circular references will raise InterpolationError (subclass of ValueError).
+    - If input_data is not list, string, path to config file, file object nor iterator, will raise ValueError.
+    - Fail to decode input_data file will result in UnicodeError, also if none of encodings detection tries decodes it.
 
 Notes:
     - When exporting config, boolean values will always be written like `True` or `False`,
@@ -105,6 +203,62 @@ print(cfg.voidsection.nonexistent)     # AttributeError exception or Nothing (bo
 print(cfg.voidsection)                 # AttributeError exception or Nothing (boolean False)
 """
 
+import asyncio
+import bisect
+import codecs
+import glob
+import hashlib
+import io
+import marshal
+import mmap as memory_map
+import os
+import re
+import stat
+import sys
+import threading
+import time
+import typing
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from fnmatch import fnmatchcase
+from functools import lru_cache, partial, wraps
+from itertools import chain, islice
+
+# kinds of tokens produced by line classification step of parsing pipeline
+COMMENT, SECTION, PROPERTY = range(3)
+
+# values consisting of other characters are never numbers, so float() is not even tried on them
+NUMBER_CHARACTERS = frozenset('0123456789+-._eE')
+INTEGER = re.compile(r'[+-]?\d+(?:_\d+)*\Z')
+
+# maximum number of distinct raw values remembered by conversion cache of Config instance
+CONVERSION_CACHE_SIZE = 4096
+
+# maximum number of distinct patterns remembered by query cache of Config instance
+QUERY_CACHE_SIZE = 256
+
+# wildcard characters of glob pattern: its literal prefix and suffix are before and after them, see _glob
+GLOB_SPECIAL = re.compile(r'[*?[\]]')
+
+# version of on-disk cache snapshot layout, bump it whenever layout changes
+CACHE_FORMAT = 4
+
+# byte order marks of Unicode encodings, UTF-32 ones first, as UTF-32-LE mark starts with UTF-16-LE one
+BYTE_ORDER_MARKS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# header line of section in config file bytes, see _classify
+SECTION_HEADER = re.compile(rb'^[ \t\f\v\r]*\[(.*)\][ \t\f\v\r]*$', re.MULTILINE)
+
+# reference to property in interpolated value: ${section.property} or ${property}, $$ stands for literal $
+REFERENCE = re.compile(r'\$(?:\$|\{([^}]*)\})')
+
 
 class Config(object):
 
@@ -120,7 +274,17 @@ class Config(object):
                  boolean_true=('yes', 'true', 'on'),
                  boolean_false=('no', 'false', 'off'),
                  encoding='utf-8',
-                 exceptions=False
+                 exceptions=False,
+                 converters=(),
+                 lazy=False,
+                 cache=None,
+                 mmap=False,
+                 stats=None,
+                 track_access=False,
+                 schema=None,
+                 interpolation=False,
+                 index=False,
+                 fallback_encodings=('latin-1',)
                  ):
         """
         Initializes Config instance.
@@ -129,171 +293,2079 @@ class Config(object):
         :param delimiter: character delimiting property and value.
         :param before_delimiter: string which will precede delimiter character when exporting config to file.
         :param after_delimiter: string which will follow up delimiter character when exporting config to file.
-        :param hierarchy: (stub) .ini-file section hierarchy type.
+        :param hierarchy: .ini-file section hierarchy type. None for flat sections, 'dotted' for nested ones:
+               section [a.b] is available as cfg.a.b and inherits properties of section [a] as defaults.
         :param parse_numbers: if set, number-looking values will be parsed as float or integer, not strings.
         :param parse_booleans: if set, boolean-looking values will be parsed as real booleans, not strings.
-        :param encoding: default is UTF-8 to manage unicode symbols in your config file
+        :param encoding: default is UTF-8 to manage unicode symbols in your config file. If 'auto', encoding of
+               config file is detected once, on a single read of its bytes: by byte order mark, else UTF-8 if it
+               decodes strictly, else the first of fallback_encodings which decodes it.
+        :param converters: additional callables, tried in order after booleans and numbers parsing.
+               Converter receives string value and returns converted value or the very same string object.
+               Conversions are memoized and shared between equal values, so converted values should be immutable.
+        :param lazy: if set, values are kept as strings and converted on first access to them.
+        :param cache: if set, parsed config file is cached on disk and later loaded from cache while file is unchanged.
+               True puts cache file next to config file, string value is a path to cache directory.
+        :param mmap: if set, config file is memory-mapped and scanned as bytes: only keys are decoded when parsing,
+               values are decoded (and converted) on first access to them, like with lazy option, which it implies.
+        :param stats: if set, timings of loading phases and counts of lines, sections, properties and conversions
+               are collected into Stats object, returned by stats() method. If callable is passed, it is called
+               with Stats object after every load and reload.
+        :param track_access: if set, number of accesses to every property is counted in Stats object. Implies stats.
+        :param schema: declaration of property types, defaults and constraints: mapping of section name (None for
+               no-section part) -> {property name -> Field or type}, or class with annotated attributes and nested
+               classes for sections. Declared properties are converted and checked while parsing, other ones
+               as usual. All errors are reported at once by SchemaError.
+        :param interpolation: if set, references ${section.property} (${property} for no-section part of config)
+               in values are replaced with texts of those properties once, at load time.
+        :param index: if set, config file is scanned for byte offsets of sections, which are parsed on first access.
+               With cache option, offsets are kept in sidecar index file, so the next loads of unchanged file
+               read its no-section part only. Ignored with hierarchy, schema or interpolation, which need whole config.
+        :param fallback_encodings: encodings tried in order if encoding is 'auto' and config file is not UTF-8.
 
-        :raise ValueError when input data is not list nor string nor path to config file
+        :raise ValueError when input data is not list, string, path to config file, file object nor iterator
         """
+        self.__options = {k: v for k, v in locals().items() if k not in ('self', 'input_data')}  # for pickling
         self.__comment_markers = comment_markers
         self.__delimiter = delimiter
         self.__delimiter_pattern = before_delimiter + delimiter + after_delimiter
         self.__hierarchy = hierarchy
         self.__parse_numbers = parse_numbers
         self.__parse_booleans = parse_booleans
-        self.__boolean_true = boolean_true
-        self.__boolean_false = boolean_false
-        self.__encoding = encoding
+        self.__booleans = {**{x.lower(): False for x in boolean_false}, **{x.lower(): True for x in boolean_true}}
+        self.__booleans_length = max(map(len, self.__booleans), default=0)
+        # encodings tried by detection, None if encoding is set explicitly
+        self.__fallback_encodings = tuple(fallback_encodings) if encoding == 'auto' else None
+        self.__encoding = 'utf-8' if encoding == 'auto' else encoding  # detected one, when config file is read
         self.__exceptions = exceptions
+        self.__miss = _section_error if exceptions else _section_nothing  # handles access to absent section
+        self.__stats = Stats() if stats or track_access else None
+        self.__stats_callback = stats if callable(stats) else None
+        self.__track_access = track_access
+        self.__converters = tuple(converter for enabled, converter in (
+            (parse_booleans, self._parse_booleans),
+            (parse_numbers, self._parse_numbers),
+            *((True, x) for x in converters)
+        ) if enabled)
+        if self.__stats is not None:
+            self.__converters = tuple(self.__stats.timed_converter(x) for x in self.__converters)
+        # sections count accesses to their properties if tracking is enabled, so disabled tracking costs nothing
+        self.__section_type = _counting_section(self.__stats) if track_access else ConfigSection
+        self.__conversions = {}  # raw value -> converted value
+        self.__lazy = lazy or mmap
+        self.__cache = cache
+        self._set_schema(schema)
+        self.__mmap = mmap and encoding != 'auto'  # detection needs whole file
+        self.__interpolation = interpolation
+        self.__graph = None  # (templates, references, dependents, texts) of interpolated values, see _interpolate
+        self.__index = index and not hierarchy and schema is None and not interpolation and encoding != 'auto'
+        self.__offsets = None  # section name (None for no-section part) -> (start, end) of its lines in indexed file
+        self.__pending = None  # names of sections of indexed file, which are not parsed yet
 
-        self.__sections = []
-        self.__properties = []
+        self.__root = None  # ConfigSection of no-section part of config, holding sections as its properties
+        self.__deferred = False  # if set, attributes absent in instance __dict__ may be lazy, default or pending ones
+        self.__sections = {}  # section name -> True, or False for implicit intermediate section of hierarchy
+        self.__properties = {}  # property name -> {section name (None for no-section part) -> None}
 
-        if isinstance(input_data, list):
-            self._parse_list(input_data)
-        elif isinstance(input_data, str):
-            if '\n' in input_data:
-                self._parse_string(input_data)
-            else:
-                self._parse_file(input_data)
+        self.__source = None  # path to config file, if config was loaded from file
+        self.__signature = None  # (modification time, size) of config file when it was read
+        self.__digests = None  # section name (None for no-section part) -> hash of its lines in config file
+        self.__reload_lock = threading.RLock()  # also taken by parsing sections of indexed file
+        self.__watching = None  # threading.Event stopping watcher thread
+        self.__provenance = None  # section name -> {property name -> source}, for layered config
+        self.__query = None  # LRU cache of query results for published state, see query
+        self.__name_indexes = None  # 'sections' or 'keys' -> index of names for query, see _glob_index
+
+        if self.__stats is None:
+            self._parse_input(input_data)
+        else:
+            self.__stats.timings.clear()
+            start = time.perf_counter()
+            self._parse_input(input_data)
+            self.__stats.timings['total'] = time.perf_counter() - start
+            self.__stats.report(self.__stats_callback)
+
+    @classmethod
+    def layered(cls, sources, workers=None, **options):
+        """
+        Creates Config object merging several sources, each later one overriding properties of earlier ones.
+        Sources are parsed in parallel, then overrides are resolved once into the same sections as usual Config has.
+        :param sources: list of sources in order of increasing priority, each one of the kinds Config accepts.
+        :param workers: maximum number of threads parsing sources, by default chosen by ThreadPoolExecutor.
+        :param options: parsing options, the same as Config accepts.
+        :return Config object, which tells source of each property with provenance() method.
+        """
+        # layers keep raw values, which are converted (and checked against schema) and interpolated once, after merging
+        layer_options = {**options, 'lazy': True, 'schema': None, 'stats': None, 'track_access': False,
+                         'interpolation': False}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            layers = list(pool.map(lambda source: cls(source, **layer_options), sources))
+        config = cls([], **{**options, 'schema': None})  # empty config is not valid against schema
+        config._merge(layers, options.get('schema'), [
+            source if isinstance(source, str) and '\n' not in source else position
+            for position, source in enumerate(sources)
+        ])
+        return config
+
+    @classmethod
+    def load_many(cls, paths, workers=None, processes=False, **options):
+        """
+        Loads many config files at once, parsing them in a pool of threads or processes.
+        :param paths: list of paths to config files, or glob pattern, like 'conf.d/*.ini'.
+        :param workers: maximum number of workers, by default chosen by executor.
+        :param processes: if True, files are parsed in separate processes, which is faster for large number of files,
+               but requires custom converters to be importable module-level functions.
+        :param options: parsing options, the same as Config accepts.
+        :return dict of path -> Config object, in order of paths.
+        :raise LoadError listing all files which failed to load, with successfully loaded ones in its configs attribute
+        """
+        if isinstance(paths, str):
+            paths = sorted(glob.glob(paths))
+        else:
+            paths = list(paths)
+        if processes:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunk_size = max(1, len(paths) // ((workers or os.cpu_count() or 1) * 4))
+                results = list(pool.map(_load, [cls] * len(paths), paths, [options] * len(paths),
+                                        chunksize=chunk_size))
         else:
-            raise ValueError('Unsupported value. Expected path to file, multiline string or list of strings')
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(lambda path: _load(cls, path, options), paths))
+
+        configs, errors = {}, {}
+        for path, (result, error) in zip(paths, results):
+            if error is not None:
+                errors[path] = error
+            else:
+                configs[path] = result
+        if errors:
+            raise LoadError(errors, configs)
+        return configs
+
+    def provenance(self, item, section=None):
+        """
+        Returns source, which value of property of layered config comes from: path to config file,
+        or position of source in list of sources if it is not a file. None if there is no such property.
+        """
+        return (self.__provenance or {}).get(section, {}).get(item)
 
     def has_section(self, item):
-        return True if item in self.__sections else False
+        return item in self.__sections
 
     def has_property(self, item, section=None):
+        properties = self.__properties
+        if (item in properties) if not section else (section in properties.get(item, ())):
+            return True
+        if not self.__pending:
+            return False
+        self._load_sections(None if not section else (section,))  # index of indexed file covers parsed sections only
         if not section:
-            return True if item in self.__properties else False
-        if self.has_section(section):
-            return True if item in self.__dict__[section] else False
+            return item in self.__properties
+        return section in self.__properties.get(item, ())
+
+    def sections_with(self, item):
+        """Returns list of sections defining property, None stands for no-section part of config."""
+        if self.__pending:  # sections defining property may be among ones not parsed yet
+            self._load_sections()
+        return list(self.__properties.get(item, ()))
+
+    def get(self, section, key, default=None):
+        """
+        Returns value of property, or default if there is no such property or section, regardless of exceptions option.
+        Takes a dict lookup per level of section name, and does not raise and catch AttributeError inside,
+        so it is faster than getattr() with default for probing optional properties.
+        :param section: section name (full one in dotted hierarchy), None for no-section part of config.
+        :param key: property name.
+        """
+        root = self.__root
+        if section is None:
+            target = root
+        elif self.__hierarchy:
+            target = self._section(section)
+        else:
+            target = _section_values(root).get(section)
+            if target is None and self.__pending and section in self.__pending:
+                self._load_sections((section,))
+                target = _section_values(self.__root).get(section)
+        if not isinstance(target, ConfigSection):
+            return default
+        values = _section_values(target)
+        value = values[key] if key in values else _resolve(target, values, key)
+        if value is _MISSING:
+            return default
+        if self.__track_access:  # misses are not counted, so they don't hide unused properties
+            self.__stats.count_access(section, key)
+        return value
+
+    def query(self, section_pattern='*', key_pattern='*'):
+        """
+        Returns list of (section name, property name, value) of properties matching glob patterns, like
+        query('db.*', '*_timeout'), sorted by section in file order, then by property name.
+        Property and section names are looked up in indexes sorted by name and by reversed name, built on first query,
+        so literal prefix or suffix of pattern narrows candidates before they are matched. Results are kept in LRU
+        cache of QUERY_CACHE_SIZE patterns, dropped with indexes when new state is published (on reload, set etc).
+        :param section_pattern: glob pattern of section name (full one in dotted hierarchy),
+               None for no-section part of config.
+        :param key_pattern: glob pattern of property name.
+        """
+        state = self.__dict__  # cache of published state is read and updated, even if reload swaps it meanwhile
+        cached = state.get('_Config__query')
+        if cached is None:
+            view = object.__new__(Config)  # queries state of cache, not later one, and state is shared by snapshots
+            view.__dict__ = state
+            cached = state['_Config__query'] = lru_cache(QUERY_CACHE_SIZE)(partial(Config._query, view))
+        return list(cached(section_pattern, key_pattern))
+
+    def set(self, section, key, value):
+        """
+        Sets property of section, adding property (and section) if it is absent. New state is published at once,
+        like on reload, and sections which are not changed are reused as they are.
+        If interpolation is enabled, only properties referencing this one, directly or through other ones,
+        are resolved again, in order of dependency graph.
+        :param section: section name (full one in dotted hierarchy), None for no-section part of config.
+        :param key: property name.
+        :param value: string is taken as value in config file: converted (and checked against schema) as parsed one,
+               and may reference other properties. Values of other types are set as they are.
+        :return set of changed keys, like reload() returns.
+        :raise InterpolationError if value references absent property or makes circular reference
+        :raise SchemaError if value does not conform to schema
+        """
+        node = (section, key)
+        with self.__reload_lock:
+            if self.__interpolation:
+                resolved, graph = self._reresolve(node, value)
+            else:
+                resolved, graph = {node: value}, None
+            if not isinstance(value, str):
+                del resolved[node]
+
+            # resolved texts are converted as parsed ones, grouped by section
+            grouped = {}
+            for (section_name, name), text in resolved.items():
+                grouped.setdefault(section_name, {})[name] = text
+            tokens = chain.from_iterable(
+                chain(() if section_name is None else ((SECTION, section_name, None),),
+                      ((PROPERTY, name, text) for name, text in texts.items()))
+                for section_name, texts in grouped.items()
+            )
+            errors, updates, section_name = [], {}, None
+            for kind, name, converted in self._converted(tokens, errors, interpolated=True):
+                if kind == SECTION:
+                    section_name = name
+                else:
+                    updates.setdefault(section_name, {})[name] = converted
+            if errors:
+                raise SchemaError(errors)
+            if not isinstance(value, str):
+                updates.setdefault(section, {})[key] = (value,) if self.__lazy else value  # see _apply_schema
+
+            # updating copies of changed sections and property index
+            convert = self._convert if self.__lazy else (lambda x: x)
+            old_sections = self._all_sections()
+            properties = dict(self.__properties)
+            changes = set()
+            updated = {}  # section name -> (properties, comments)
+            for section_name, section_updates in updates.items():
+                old = old_sections.get(section_name)
+                old_properties = {} if old is None else self._section_items(old)[0]
+                for name, new in section_updates.items():
+                    if name not in old_properties:
+                        properties[name] = {**properties.get(name, {}), section_name: None}
+                    else:
+                        old_value, new_value = convert(old_properties[name]), convert(new)
+                        if type(old_value) is type(new_value) and old_value == new_value:
+                            continue
+                    changes.add(name if section_name is None else section_name + '.' + name)
+                updated[section_name] = ({**old_properties, **section_updates},
+                                         None if old is None else old._ConfigSection__comments)
+
+            self._publish_sections(updated, properties=properties, graph=graph)
+            return changes
+
+    def diff(self, other):
+        """
+        Returns Changeset turning this config into other one: added and removed sections, added, removed and changed
+        properties, compared after conversion. Sections shared by both configs (like unchanged sections of snapshot
+        and of reloaded config) are skipped at once. Content digests of the others are memoized in sections, and only
+        sections with different digests are compared property by property.
+        """
+        changeset = Changeset()
+        old_sections, new_sections = self._all_sections(), other._all_sections()
+        for name, old in old_sections.items():
+            new = new_sections.get(name)
+            if new is None:
+                changeset.removed_sections[name] = list(self._section_items(old)[0])
+                continue
+            if old is new:
+                continue
+            if self._section_digest(old) == other._section_digest(new):
+                continue
+            old_properties, new_properties = self._section_properties(old), other._section_properties(new)
+            added = {key: value for key, value in new_properties.items() if key not in old_properties}
+            removed = [key for key in old_properties if key not in new_properties]
+            changed = {key: (value, new_properties[key]) for key, value in old_properties.items()
+                       if key in new_properties and (type(value) is not type(new_properties[key])
+                                                     or value != new_properties[key])}
+            if added:
+                changeset.added[name] = added
+            if removed:
+                changeset.removed[name] = removed
+            if changed:
+                changeset.changed[name] = changed
+        for name, new in new_sections.items():
+            if name not in old_sections:
+                changeset.added_sections[name] = (other._section_properties(new), new._ConfigSection__comments)
+        return changeset
+
+    def apply(self, changeset):
+        """
+        Applies Changeset made by diff() to this config. New state is published at once, like on reload, keeping
+        comments and order of properties which write() relies on: changed properties stay in place, added ones
+        are appended to their sections, and comments keep their positions among remaining lines.
+        Sections which are not changed are reused as they are.
+        :return set of changed keys, like reload() returns.
+        """
+        with self.__reload_lock:
+            wrap = (lambda x: (x,)) if self.__lazy else (lambda x: x)  # values are converted already, see _convert
+            old_sections = self._all_sections()
+            properties = dict(self.__properties)
+            updated = {}  # section name -> (properties, comments)
+            touched = {}  # (section name, property name) -> new value, None for removed property
+            for name in chain(changeset.added, changeset.removed, changeset.changed):
+                if name in updated:
+                    continue
+                section = old_sections.get(name)
+                section_properties = {} if section is None else dict(self._section_items(section)[0])
+                comments = None if section is None else section._ConfigSection__comments
+                removed = changeset.removed.get(name, ())
+                if removed:
+                    comments = _shift_comments(comments, list(section_properties), set(removed))
+                    for key in removed:
+                        touched[name, key] = None
+                        if section_properties.pop(key, _MISSING) is not _MISSING:
+                            owners = {**properties[key]}
+                            del owners[name]
+                            if owners:
+                                properties[key] = owners
+                            else:
+                                del properties[key]
+                for key, (_, value) in changeset.changed.get(name, {}).items():
+                    section_properties[key] = wrap(value)
+                    touched[name, key] = value
+                for key, value in changeset.added.get(name, {}).items():
+                    section_properties[key] = wrap(value)
+                    touched[name, key] = value
+                    properties[key] = {**properties.get(key, {}), name: None}
+                updated[name] = (section_properties, comments)
+            for name, (section_properties, comments) in changeset.added_sections.items():
+                updated[name] = ({key: wrap(value) for key, value in section_properties.items()}, comments)
+                for key, value in section_properties.items():
+                    touched[name, key] = value
+                    properties[key] = {**properties.get(key, {}), name: None}
+            for name in changeset.removed_sections:
+                for key in self._section_items(old_sections[name])[0] if name in old_sections else ():
+                    touched[name, key] = None
+                    owners = {**properties[key]}
+                    del owners[name]
+                    if owners:
+                        properties[key] = owners
+                    else:
+                        del properties[key]
+
+            graph = self.__graph
+            if graph is not None:  # applied values are final, so their templates are dropped
+                templates = {node: template for node, template in graph[0].items() if node not in touched}
+                texts = {node: text if node not in touched or touched[node] is None
+                         else touched[node] if isinstance(touched[node], str) else str(touched[node])
+                         for node, text in graph[3].items()}
+                graph = (templates, *_dependency_graph(templates), texts)
+            self._publish_sections(updated, changeset.removed_sections, properties=properties, graph=graph)
+            return changeset.keys()
+
+    def to_dict(self):
+        """
+        Returns config as dict: properties of no-section part, then sections as dicts of their properties
+        (and subsections, in dotted hierarchy). Values are converted, comments and defaults are not included.
+        """
+        if self.__pending:
+            self._load_sections()
+        return self._section_dict(self.__root)
+
+    @classmethod
+    def from_dict(cls, data, **options):
+        """
+        Creates Config object from dict of the same structure as to_dict() returns. Values are taken as they are,
+        without conversion. If schema is passed, its defaults are set and required properties are checked.
+        :param options: parsing options, the same as Config accepts (lazy and mmap are ignored).
+        """
+        config = cls([], **{**options, 'lazy': False, 'mmap': False, 'schema': None})
+        config._set_schema(options.get('schema'))
+        config._parse_dict(data)
+        return config
+
+    def __getstate__(self):
+        """
+        Returns state for pickling: parsing options and snapshot of parsed data as builtin types, so config is
+        restored without parsing it again. Custom converters and types of schema must be picklable themselves,
+        stats callback is not pickled.
+        """
+        options = self.__options
+        if callable(options['stats']):
+            options = {**options, 'stats': True}
+        return options, self._snapshot(), self.__source, self.__signature, self.__provenance, self.__encoding
+
+    def __setstate__(self, state):
+        options, snapshot, source, signature, provenance, encoding = state
+        self.__init__([], **{**options, 'schema': None})
+        self._set_schema(options['schema'])
+        self.__source, self.__signature, self.__provenance, self.__encoding = source, signature, provenance, encoding
+        self._restore(snapshot)
+
+    def stats(self):
+        """Returns Stats object with instrumentation data, or None if stats option was not set."""
+        return self.__stats
+
+    def reload(self):
+        """
+        Re-reads config file if it was modified since last load. Only sections which text has changed are parsed
+        again, the others are reused as they are. New state is published at once, by replacing instance __dict__.
+        :return set of changed keys: "section.property", or just "property" for no-section part of config.
+        :raise ValueError when config was not loaded from file
+        """
+        stats = self.__stats
+        if stats is None:
+            return self._reload()
+        start = time.perf_counter()
+        changes = self._reload()
+        if changes:
+            stats.timings['reload'] = time.perf_counter() - start
+            stats.report(self.__stats_callback)
+        return changes
+
+    def _reload(self):
+        """Does the job of reload method."""
+        if self.__source is None:
+            raise ValueError('Only config loaded from file can be reloaded')
+        with self.__reload_lock:
+            stat = os.stat(self.__source)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature == self.__signature:
+                return set()
+            if self.__offsets is not None:
+                return self._reindex()
+            if self.__fallback_encodings is None:
+                with open(self.__source, 'r', encoding=self.__encoding) as f:
+                    blocks = self._split_blocks(x.strip() for x in f)
+            else:  # encoding is detected again, so file is read as bytes
+                with open(self.__source, 'rb') as f:
+                    blocks = self._split_blocks(x.strip() for x in io.StringIO(self._decode(f.read()), newline=None))
+            digests = {name: hash(tuple(lines)) for name, lines in blocks.items()}
+            old_digests = self.__digests or {}
+            changed = [name for name, digest in digests.items() if old_digests.get(name) != digest]
+            if self.__interpolation:
+                changed = list(blocks)  # references cross sections, so config is resolved again as a whole
+                graph = self.__graph
+
+            # parsing changed blocks only, with throwaway indexes
+            lines = chain.from_iterable(
+                blocks[name] if name is None else chain(('[' + name + ']',), blocks[name]) for name in changed
+            )
+            errors = []
+            parsed = self._default_parser(self._converted(self._classify(lines), errors), {}, {})
+            parsed_properties, parsed_sections = self._section_items(parsed)
+            old_properties, old_sections = self._section_items(self.__root)[0], self._flat_sections()
+
+            if None in changed:
+                root, root_comments = dict(parsed_properties), parsed._ConfigSection__comments
+            else:
+                root, root_comments = dict(old_properties), self.__root._ConfigSection__comments
+            for name in blocks:
+                if name is not None:
+                    root[name] = parsed_sections[name] if name in parsed_sections else old_sections[name]
+
+            # collecting changed keys and updating copy of property index for changed and removed sections
+            changes = set()
+            properties = dict(self.__properties)
+            removed = [name for name in old_sections if name not in blocks]
+            for name in chain(changed, removed):
+                if name is None:
+                    old, new, prefix = old_properties, parsed_properties, ''
+                else:
+                    old = self._section_items(old_sections[name])[0] if name in old_sections else {}
+                    new = self._section_items(parsed_sections[name])[0] if name in parsed_sections else {}
+                    prefix = name + '.'
+                for key in old.keys() | new.keys():
+                    old_value = old.get(key)
+                    if type(old_value) is bytes:  # raw value of memory-mapped file
+                        old_value = old_value.decode(self.__encoding)
+                    if key not in old or key not in new or type(old_value) is not type(new[key]) \
+                            or old_value != new[key]:
+                        changes.add(prefix + key)
+                    if key not in new:
+                        owners = {**properties[key]}
+                        del owners[name]
+                        if owners:
+                            properties[key] = owners
+                        else:
+                            del properties[key]
+                    elif key not in old:
+                        properties[key] = {**properties.get(key, {}), name: None}
+
+            convert = self._convert if self.__lazy else None
+            sections = {name: True for name in blocks if name is not None}
+            root = self.__section_type(self.__exceptions, root_comments, None, root, convert)
+            try:
+                root = self._finish(root, sections, errors)
+            except SchemaError:
+                if self.__interpolation:
+                    self.__graph = graph  # replaced while parsing, but config keeps its previous state
+                raise
+            self._publish(
+                root,
+                sections=sections,
+                properties=properties,
+                signature=signature,
+                digests=digests
+            )
+            return changes
+
+    def watch(self, callback=None, interval=1.0):
+        """
+        Starts daemon thread, which polls config file every interval seconds and reloads it when it is modified.
+        :param callback: if passed, it will be called with set of changed keys after every reload changing them.
+        :param interval: polling interval in seconds.
+        """
+        if self.__source is None:
+            raise ValueError('Only config loaded from file can be watched')
+        Config.unwatch(self)  # methods are not looked up on instance, where properties may shadow them
+        stop = threading.Event()
+
+        def poll():
+            while not stop.wait(interval):
+                try:
+                    changes = Config.reload(self)
+                except (OSError, UnicodeError):
+                    continue  # file is being replaced right now, will try next time
+                if changes and callback:
+                    callback(changes)
+
+        with self.__reload_lock:
+            self.__watching = stop
+        threading.Thread(target=poll, name=f'liteconfig watcher: {self.__source}', daemon=True).start()
+
+    def unwatch(self):
+        """Stops watching config file."""
+        with self.__reload_lock:
+            if self.__watching:
+                self.__watching.set()
+            self.__watching = None
+
+    @classmethod
+    async def aload(cls, input_data, executor=None, **options):
+        """
+        Creates Config object without blocking event loop: reading and parsing input are run in executor.
+        :param input_data: any input Config accepts.
+        :param executor: concurrent.futures executor, default executor of event loop if None.
+        :param options: parsing options, the same as Config accepts.
+        """
+        # inside coroutine it is the running loop, and unlike get_running_loop() it exists in Python 3.6
+        return await asyncio.get_event_loop().run_in_executor(executor, partial(cls, input_data, **options))
+
+    async def areload(self, executor=None):
+        """Runs reload() in executor, so event loop is not blocked. Returns set of changed keys."""
+        return await asyncio.get_event_loop().run_in_executor(executor, partial(Config.reload, self))
+
+    async def awrite(self, file, executor=None):
+        """Runs write() in executor, so event loop is not blocked."""
+        await asyncio.get_event_loop().run_in_executor(executor, partial(Config.write, self), file)
+
+    async def changes(self, interval=1.0, executor=None):
+        """
+        Asynchronous iterator polling config file every interval seconds, reloading it in executor when it is modified,
+        and yielding set of changed keys after every reload changing them. Stops when loop breaks out of it.
+        """
+        if self.__source is None:
+            raise ValueError('Only config loaded from file can be watched')
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                changes = await Config.areload(self, executor)
+            except (OSError, UnicodeError):
+                continue  # file is being replaced right now, will try next time
+            if changes:
+                yield changes
+
+    def snapshot(self):
+        """Returns Config object sharing current state of this one, which is not affected by later reloads."""
+        snapshot = object.__new__(Config)
+        snapshot.__dict__ = self.__dict__
+        return snapshot
 
     def write(self, file):
-        """Export config to file with the same settings as it was read in."""
-        export_list = self._export(self)
-        export_lines = '\n'.join([x for x in export_list if not isinstance(x, list)])
-        with open(file, 'w', encoding=self.__encoding) as f:
-            f.writelines(export_lines)
-
-    def _export(self, section, accumulator=None):
-        """Returns config representation as list of strings"""
-        if accumulator is None:
-            accumulator = []
-            
-        # filtering out auxiliary keys
-        section_items = {k: v for k, v in section.__dict__.items() if not k.startswith('_')}
-
-        # adding comments or regular properties
-        items = iter(section_items)
-        for comment in section._ConfigSection__comments:
-            if comment is None:
-                key = next(items)
-                value = section_items[key]
-                accumulator.append(key + self.__delimiter_pattern + str(value))
+        """
+        Export config to file with the same settings as it was read in.
+        Lines are streamed to file one by one, so config is never rendered as a whole in memory.
+        :param file: path to file or writable text or binary stream (file object, io.StringIO, io.BytesIO etc).
+               File on disk is replaced atomically: config is written to temporary file, which is renamed then.
+        """
+        if hasattr(file, 'write'):
+            if isinstance(file, (io.RawIOBase, io.BufferedIOBase)):
+                file = codecs.getwriter(self.__encoding)(file)
+            self._write_lines(file)
+        else:
+            with self._atomic_open(file, 'w', self.__encoding) as f:
+                self._write_lines(f)
+
+    def _write_lines(self, stream):
+        """Writes exported lines to stream, separated by newlines."""
+        write = stream.write
+        lines = self._export()
+        first = next(lines, None)
+        if first is not None:
+            write(first)
+        for line in lines:
+            write('\n')
+            write(line)
+
+    @staticmethod
+    @contextmanager
+    def _atomic_open(file, mode, encoding=None):
+        """
+        Opens temporary file next to file, which replaces file on successful exit from context, so readers
+        of file never see it partially written. Permissions of existing file are kept.
+        """
+        temp_file = f'{file}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(temp_file, mode, encoding=encoding) as f:
+                yield f
+            try:
+                os.chmod(temp_file, stat.S_IMODE(os.stat(file).st_mode))
+            except FileNotFoundError:
+                pass  # new file gets default permissions
+            os.replace(temp_file, file)
+        except BaseException:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+
+    def _export(self):
+        """Yields config representation line by line."""
+        if self.__pending:
+            self._load_sections()
+        yield from self._export_section(self.__root)
+        for name, defined in self.__sections.items():
+            if defined:  # implicit intermediate sections of hierarchy have no lines in config
+                yield '[' + name + ']'
+                yield from self._export_section(self._section(name))
+
+    def _export_section(self, section):
+        """Yields comments and properties of section (without subsections) line by line."""
+        delimiter_pattern = self.__delimiter_pattern
+        properties = self._section_items(section)[0].items()
+        templates = self.__graph[0] if self.__graph else None
+        if templates:  # values with references are exported as they were written, not resolved
+            section_name = _section_name(section)
+            convert = self._convert if self.__lazy else str
+            property_lines = (k + delimiter_pattern + (templates[section_name, k] if (section_name, k) in templates
+                                                       else str(convert(v))) for k, v in properties)
+        elif self.__lazy:
+            convert = self._convert
+            property_lines = (k + delimiter_pattern + str(convert(v)) for k, v in properties)
+        else:
+            property_lines = (k + delimiter_pattern + str(v) for k, v in properties)
+
+        # comments at their positions, regular properties in between
+        position = 0
+        for comment_position, comment in (section._ConfigSection__comments or {}).items():
+            yield from islice(property_lines, comment_position - position)
+            yield comment
+            position = comment_position + 1
+        yield from property_lines
+
+    def _section_dict(self, section):
+        """Returns dict of converted properties and subsections of section, see to_dict()."""
+        properties, subsections = self._section_items(section)
+        result = {key: self._convert(value) for key, value in properties.items()} if self.__lazy else dict(properties)
+        defined = self.__sections
+        for key, subsection in subsections.items():
+            subsection_dict = self._section_dict(subsection)
+            if subsection_dict or defined.get(_section_name(subsection)):  # sections with schema defaults only
+                result[key] = subsection_dict
+        return result
+
+    def _section(self, name):
+        """Returns section by its full name, walking down levels of hierarchy. None if there is no such section."""
+        section = self.__root
+        for part in name.split('.') if self.__hierarchy else (name,):
+            section = section._ConfigSection__values.get(part)
+            if not isinstance(section, ConfigSection):
+                return None
+        return section
+
+    def _flat_sections(self):
+        """Returns dict of section name -> ConfigSection for sections defined in config, in file order."""
+        if self.__pending:
+            self._load_sections()
+        return {name: self._section(name) for name, defined in self.__sections.items() if defined}
+
+    def _all_sections(self):
+        """Returns dict of section name -> ConfigSection, starting with None -> no-section part of config."""
+        return {None: self.__root, **self._flat_sections()}
+
+    def _section_properties(self, section):
+        """Returns dict of converted properties of section, without subsections and defaults."""
+        properties = self._section_items(section)[0]
+        if self.__lazy:
+            convert = self._convert
+            return {key: convert(value) for key, value in properties.items()}
+        return dict(properties)
+
+    def _section_digest(self, section):
+        """
+        Returns blake2b digest of converted properties of section, encoded as reprs of their keys, type names and
+        values, so sections with equal digests have equal properties. Digest is memoized in section, as sections
+        are never changed, so it is shared by all configs (and snapshots) holding the section.
+        """
+        digest = _section_digest(section)
+        if digest is not None:
+            return digest
+        convert = self._convert if self.__lazy else (lambda x: x)
+        encoded = repr([(key, type(value).__qualname__, value) for key, value in
+                        ((key, convert(value)) for key, value in self._section_items(section)[0].items())])
+        digest = hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).digest()
+        _memoize_digest(section, digest)
+        return digest
+
+    def _publish_sections(self, updated, removed=(), **attributes):
+        """
+        Publishes new state with sections replaced by updated ones, and removed ones dropped. Updated sections absent
+        in config are appended to it, sections which are not changed are reused as they are.
+        :param updated: dict of section name (None for no-section part) -> (dict of properties, comments).
+        :param removed: collection of names of removed sections.
+        :param attributes: private attributes of Config to publish with new state, see _publish.
+        """
+        convert = self._convert if self.__lazy else None
+        old_sections = self._all_sections()
+        if None in updated:
+            root_properties, root_comments = updated[None]
+        else:
+            root_properties, root_comments = self._section_items(self.__root)[0], self.__root._ConfigSection__comments
+        root = dict(root_properties)
+        sections = {}
+        for name in chain(old_sections, [x for x in updated if x not in old_sections]):
+            if name is None or name in removed:
+                continue
+            if name in updated:
+                section_properties, comments = updated[name]
+                root[name] = self.__section_type(self.__exceptions, comments, name, section_properties, convert)
             else:
-                accumulator.append(comment)
+                root[name] = old_sections[name]
+            sections[name] = True
+        root = self.__section_type(self.__exceptions, root_comments, None, root, convert)
+        if self.__digests:  # sections no longer match file, so next reload parses them again and reports them
+            attributes['digests'] = {
+                name: digest for name, digest in self.__digests.items() if name not in updated and name not in removed
+            }
+        self._publish(self._finish(root, sections), sections=sections, **attributes)
 
-        # adding sections, recursively calling export function for new sections
-        for key in items:
-            value = section_items[key]
-            accumulator.append('[' + key + ']')
-            accumulator.append(self._export(value, accumulator))
-            
-        return accumulator
+    @staticmethod
+    def _section_items(section):
+        """
+        Splits section contents into properties and subsections, both in file order.
+        Properties of lazy section are returned as raw (not converted) values.
+        """
+        raw = section._ConfigSection__raw
+        properties, sections = {}, {}
+        for key, value in section._ConfigSection__values.items():
+            if isinstance(value, ConfigSection):
+                sections[key] = value
+            elif raw is None:
+                properties[key] = value
+        return (properties if raw is None else raw), sections
+
+    def _query(self, section_pattern, key_pattern):
+        """Does the job of query method, returning tuple of results to be cached."""
+        if section_pattern is None:
+            section_names = [None]
+        else:
+            positions = {name: position for position, name in enumerate(
+                name for name, defined in self.__sections.items() if defined)}
+            section_names = sorted(_glob(self._name_index('sections', positions), section_pattern),
+                                   key=positions.__getitem__)
+            if self.__pending and any(x in self.__pending for x in section_names):
+                self._load_sections(section_names)
+        properties = self.__properties
+        keys = _glob(self._name_index('keys', properties), key_pattern)
+        sections = dict.fromkeys(section_names, None)
+        found = {}  # section name -> property names
+        if len(keys) <= len(sections):
+            for key in sorted(keys):
+                for section_name in properties[key]:
+                    if section_name in sections:
+                        found.setdefault(section_name, []).append(key)
+        else:
+            keys = set(keys)
+            for section_name in sections:
+                owned = [key for key in self._section_keys(section_name) if key in keys]
+                if owned:
+                    found[section_name] = sorted(owned)
+        get = partial(Config.get, self)  # not looked up on instance, where property may shadow it
+        return tuple((section_name, key, get(section_name, key))
+                     for section_name in sections if section_name in found for key in found[section_name])
+
+    def _section_keys(self, section_name):
+        """Returns names of properties of section, without subsections and defaults."""
+        section = self.__root if section_name is None else self._section(section_name)
+        return self._section_items(section)[0] if section is not None else ()
+
+    def _name_index(self, kind, names):
+        """Returns index of names of sections or properties for query method (see _glob_index), built once per state."""
+        state = self.__dict__
+        indexes = state.get('_Config__name_indexes')
+        if indexes is None:
+            indexes = state['_Config__name_indexes'] = {}
+        index = indexes.get(kind)
+        if index is None:
+            index = indexes[kind] = _glob_index(names)
+        return index
+
+    def _snapshot(self):
+        """Returns parsed config data structures as tuple of builtin types, suitable for marshal."""
+        return (
+            self.__root._ConfigSection__comments,
+            self._section_items(self.__root)[0],
+            [(name, section._ConfigSection__comments, self._section_items(section)[0])
+             for name, section in self._flat_sections().items()],
+            self.__properties,
+            self.__graph and (self.__graph[0], self.__graph[3])  # templates and texts of interpolated values
+        )
+
+    def _restore(self, snapshot):
+        """Used to initialize Config object data structures from snapshot made by _snapshot method."""
+        root_comments, root_properties, section_list, properties, graph = snapshot
+        if graph is not None:
+            templates, texts = graph
+            self.__graph = (templates, *_dependency_graph(templates), texts)
+        convert = self._convert if self.__lazy else None
+        root = dict(root_properties)
+        sections = {}
+        for name, comments, section_properties in section_list:
+            root[name] = self.__section_type(self.__exceptions, comments, name, section_properties, convert)
+            sections[name] = True
+        root = self.__section_type(self.__exceptions, root_comments, None, root, convert)
+        self._publish(self._finish(root, sections), sections=sections, properties=properties)
+
+    def _merge(self, layers, schema, names):
+        """
+        Used to initialize Config object data structures by merging parsed layers, later ones overriding earlier.
+        :param layers: list of Config objects.
+        :param schema: schema to check merged config against, None if there is none.
+        :param names: list of source names, recorded as provenance of properties of respective layers.
+        """
+        merged = {None: {}}  # section name -> properties
+        provenance = {None: {}}
+        for layer, name in zip(layers, names):
+            for section_name, section in chain(((None, layer.__root),), layer._flat_sections().items()):
+                section_properties = self._section_items(section)[0]
+                merged.setdefault(section_name, {}).update(section_properties)
+                provenance.setdefault(section_name, {}).update(dict.fromkeys(section_properties, name))
+
+        self._set_schema(schema)
+        # merged properties are parsed as tokens, so they are converted the same way as parsed from single source
+        tokens = chain.from_iterable(
+            chain(() if section_name is None else ((SECTION, section_name, None),),
+                  ((PROPERTY, key, value) for key, value in section_properties.items()))
+            for section_name, section_properties in merged.items()
+        )
+        errors, sections, properties = [], {}, {}
+        root = self._default_parser(self._converted(tokens, errors), sections, properties)
+        self._publish(self._finish(root, sections, errors),
+                      sections=sections, properties=properties, provenance=provenance)
+
+    def _publish(self, root, **attributes):
+        """
+        Replaces instance state at once with the new one: private attributes of Config (updated with passed ones),
+        root section and its contents, which are put to instance __dict__ for fast access by dot notation.
+        """
+        state = {k: v for k, v in self.__dict__.items() if k.startswith('_Config__')}
+        state['_Config__query'] = state['_Config__name_indexes'] = None  # built again for new state, on demand
+        state.update(('_Config__' + k, v) for k, v in attributes.items())
+        state['_Config__root'] = root
+        if not self.__track_access:  # otherwise properties are read through root section, which counts accesses
+            state.update(root._ConfigSection__values)
+        # misses go straight to miss handler, unless some properties or sections are not in instance __dict__ yet
+        state['_Config__deferred'] = bool(self.__track_access or _section_raw(root) or _section_defaults(root)
+                                          or state.get('_Config__pending'))
+        self.__dict__ = state
+
+    def _parse_input(self, input_data):
+        """Dispatches input data to parsing method depending on its type."""
+        if isinstance(input_data, list):
+            self._parse_list(input_data)
+        elif isinstance(input_data, str):
+            if '\n' in input_data:
+                self._parse_string(input_data)
+            else:
+                self._parse_file(input_data)
+        elif isinstance(input_data, (io.RawIOBase, io.BufferedIOBase)):
+            if self.__fallback_encodings is None:
+                self._parse_list(codecs.iterdecode(input_data, self.__encoding))
+            else:
+                self._parse_list(io.StringIO(self._decode(input_data.read()), newline=None))
+        elif isinstance(input_data, Iterator):  # text file objects and generators of lines
+            self._parse_list(input_data)
+        else:
+            raise ValueError('Unsupported value. Expected path to file, multiline string, '
+                             'list of strings, file object or iterator of strings')
 
     def _parse_file(self, config_file):
-        """Used to initialize Config object data structures from file"""
+        """Used to initialize Config object data structures from file, reading it line by line"""
+        self.__source = config_file
+        if self.__index and '\n[]'.encode(self.__encoding) == b'\n[]':  # scanning bytes needs ASCII-based encoding
+            with open(config_file, 'rb') as f:
+                return self._index_file(f)
+        if self.__cache:
+            return self._parse_cached_file(config_file)
+        if self.__mmap and '\n[]'.encode(self.__encoding) == b'\n[]':  # scanning bytes needs ASCII-based encoding
+            return self._parse_mapped_file(config_file)
+        if self.__fallback_encodings is not None:
+            return self._parse_detected_file(config_file)
         with open(config_file, 'r', encoding=self.__encoding) as f:
-            config_lines = f.readlines()
-            self._parse_list(config_lines)
+            stat = os.fstat(f.fileno())
+            self.__signature = (stat.st_mtime_ns, stat.st_size)
+            self._parse_list(f, track_blocks=True)
+
+    def _parse_detected_file(self, config_file):
+        """
+        Used to initialize Config object data structures from file of unknown encoding: it is read as bytes once,
+        and decoded with detected encoding.
+        """
+        with open(config_file, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            data = f.read()
+        self.__signature = (stat.st_mtime_ns, stat.st_size)
+        self._parse_list(io.StringIO(self._decode(data), newline=None), track_blocks=True)
+
+    def _decode(self, data):
+        """
+        Decodes bytes of config file with encoding option, or with detected encoding if it is 'auto': the one of byte
+        order mark, if data starts with it, else UTF-8, if data is valid UTF-8, else the first of fallback encodings
+        which decodes data. Detected encoding is remembered, so config is written in it.
+        :raise UnicodeError if data can not be decoded with any of candidate encodings
+        """
+        if self.__fallback_encodings is None:
+            return data.decode(self.__encoding)
+        for mark, encoding in BYTE_ORDER_MARKS:
+            if data.startswith(mark):
+                candidates = (encoding,)
+                break
+        else:
+            candidates = ('utf-8', *self.__fallback_encodings)
+        for encoding in candidates:
+            try:
+                text = data.decode(encoding)  # strict, so the first error stops trying encoding
+            except UnicodeDecodeError:
+                continue
+            self.__encoding = encoding
+            return text
+        raise UnicodeError(f'Config can not be decoded with any of encodings: {", ".join(candidates)}')
+
+    def _parse_cached_file(self, config_file):
+        """
+        Used to initialize Config object data structures from cache snapshot of file, if file has the same
+        modification time, size and content hash as when snapshot was made, or from file itself otherwise.
+        """
+        cache_file = self._cache_file(config_file, '.cache')
+        with open(config_file, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            data = f.read()
+        self.__signature = (stat.st_mtime_ns, stat.st_size)
+        key = [
+            CACHE_FORMAT,
+            stat.st_mtime_ns,
+            stat.st_size,
+            hashlib.blake2b(data, digest_size=16).digest(),
+            # parsing options which affect snapshot contents
+            self.__encoding if self.__fallback_encodings is None else ['auto', *self.__fallback_encodings],
+            self.__delimiter,
+            self.__comment_markers,
+            repr(self.__hierarchy),
+            self.__lazy,
+            sorted(self.__booleans.items()),
+            repr(self.__schema_fields),
+            self.__interpolation,
+            [getattr(x, '__module__', '') + '.' + getattr(x, '__qualname__', repr(x)) for x in self.__converters]
+        ]
+
+        try:
+            with open(cache_file, 'rb') as f:
+                cached_key, encoding, snapshot = marshal.loads(f.read())
+            if cached_key == key:
+                self.__encoding = encoding  # detected one, if encoding is 'auto'
+                return self._restore(snapshot)
+        except (OSError, EOFError, ValueError, TypeError):
+            pass  # absent or broken cache file is just a cache miss
+
+        self._parse_list(io.StringIO(self._decode(data), newline=None), track_blocks=True)
+        try:
+            cache_data = marshal.dumps((key, self.__encoding, self._snapshot()))
+        except ValueError:
+            return  # values produced by custom converters can't be cached
+        try:
+            with self._atomic_open(cache_file, 'wb') as f:
+                f.write(cache_data)
+        except OSError:
+            pass  # cache is optional, config is already parsed
+
+    def _cache_file(self, config_file, suffix):
+        """Returns path to cache file of config file: next to it, or in cache directory under hash of its path."""
+        if self.__cache is True:
+            return config_file + suffix
+        os.makedirs(self.__cache, exist_ok=True)
+        path_hash = hashlib.blake2b(os.path.abspath(config_file).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.__cache, path_hash + suffix)
+
+    def _index_file(self, f):
+        """
+        Used to initialize Config object data structures from binary file object of config file, parsing its
+        no-section part only. Other sections are recorded by byte offsets of their lines, and parsed on first access.
+        With cache option, offsets are read from sidecar index file while config file has the same modification time
+        and size, so its sections are not even scanned.
+        """
+        stat = os.fstat(f.fileno())
+        signature = (stat.st_mtime_ns, stat.st_size)
+        index_file = self._cache_file(self.__source, '.index') if self.__cache else None
+        key = [CACHE_FORMAT, *signature, self.__encoding, self.__comment_markers]
+        offsets = None
+        if index_file is not None:
+            try:
+                with open(index_file, 'rb') as index:
+                    cached_key, offsets = marshal.loads(index.read())
+                if cached_key != key:
+                    offsets = None
+            except (OSError, EOFError, ValueError, TypeError):
+                pass  # absent or broken index file is just a cache miss
+        if offsets is None:
+            offsets = self._scan_sections(f, stat.st_size)
+            if index_file is not None:
+                try:
+                    with self._atomic_open(index_file, 'wb') as index:
+                        index.write(marshal.dumps((key, offsets)))
+                except OSError:
+                    pass  # index file is optional, file is already scanned
+
+        start, end = offsets[None]
+        f.seek(start)
+        lines = io.StringIO(f.read(end - start).decode(self.__encoding), newline=None)
+        properties = {}
+        root = self._default_parser(self._converted(self._classify(x.strip() for x in lines), []), {}, properties)
+        names = [name for name in offsets if name is not None]
+        self._publish(root, sections=dict.fromkeys(names, True), properties=properties, signature=signature,
+                      offsets=offsets, pending=set(names))
+
+    def _scan_sections(self, f, size):
+        """
+        Returns dict of section name (None for no-section part of config) -> (start, end) byte offsets of its lines
+        in file, excluding header. Section headers are found in memory-mapped file by regular expression,
+        so file is neither split into lines nor decoded.
+        """
+        encoding = self.__encoding
+        offsets = {}
+        section_name, start = None, 0
+        if size and '[' not in self.__comment_markers:
+            with memory_map.mmap(f.fileno(), 0, access=memory_map.ACCESS_READ) as data:
+                for match in SECTION_HEADER.finditer(data):
+                    offsets[section_name] = (start, match.start())  # redefined section replaces previous one
+                    section_name, start = match.group(1).decode(encoding), match.end() + 1
+        offsets[section_name] = (start, max(start, size))
+        return offsets
+
+    def _load_sections(self, names=None):
+        """
+        Parses sections of indexed config file, which are not parsed yet: given ones, or all of them by default.
+        Parsed sections are added to published state in place, so this is idempotent, and it is done under lock.
+        If file was modified since it was indexed, offsets are outdated, and config is reloaded first.
+        """
+        with self.__reload_lock:
+            while True:
+                pending = self.__pending
+                if not pending:
+                    return
+                loaded = [x for x in (self.__offsets if names is None else names) if x in pending]
+                if not loaded:
+                    return
+                with open(self.__source, 'rb') as f:
+                    stat = os.fstat(f.fileno())
+                    if (stat.st_mtime_ns, stat.st_size) == self.__signature:
+                        return self._parse_sections(f, loaded)
+                Config.reload(self)  # not looked up on instance, where property of no-section part may shadow it
+
+    def _parse_sections(self, f, names):
+        """Parses sections of indexed config file from its binary file object, see _load_sections."""
+        encoding = self.__encoding
+        offsets, pending, properties = self.__offsets, self.__pending, self.__properties
+        root_values = _section_values(self.__root)
+        state = self.__dict__
+        for name in names:
+            start, end = offsets[name]
+            f.seek(start)
+            lines = io.StringIO(f.read(end - start).decode(encoding), newline=None)
+            tokens = chain(((SECTION, name, None),), self._classify(x.strip() for x in lines))
+            section = _section_values(self._default_parser(self._converted(tokens, []), {}, properties))[name]
+            root_values[name] = section
+            if not self.__track_access:
+                state[name] = section
+            state['_Config__query'] = state['_Config__name_indexes'] = None  # indexes of query miss parsed section
+            pending.discard(name)  # the last, so readers which don't take lock see section before it is discarded
+
+    def _reindex(self):
+        """
+        Does the job of reload method for indexed config file: scans it again, parsing sections which were parsed
+        before. Changes in sections which were not accessed yet are not reported.
+        """
+        old_properties, old_sections = self._section_items(self.__root)
+        old_sections = {name: self._section_items(section)[0] for name, section in old_sections.items()}
+        with open(self.__source, 'rb') as f:
+            self._index_file(f)
+            self._parse_sections(f, [name for name in old_sections if name in self.__pending])
+        new_properties, new_sections = self._section_items(self.__root)
+        changes = self._changes(None, old_properties, new_properties)
+        for name, old in old_sections.items():
+            changes |= self._changes(name, old, self._section_items(new_sections[name])[0] if name in new_sections
+                                     else {})
+        return changes
+
+    def _changes(self, section_name, old, new):
+        """Returns set of changed keys of section, comparing dicts of its old and new properties."""
+        if self.__lazy:
+            convert = self._convert
+            old = {key: convert(value) for key, value in old.items()}
+            new = {key: convert(value) for key, value in new.items()}
+        prefix = '' if section_name is None else section_name + '.'
+        return {prefix + key for key in old.keys() | new.keys()
+                if key not in old or key not in new or type(old[key]) is not type(new[key]) or old[key] != new[key]}
+
+    def _parse_mapped_file(self, config_file):
+        """
+        Used to initialize Config object data structures from memory-mapped file, so it is not read as a whole
+        nor decoded: values are kept as bytes and decoded on first access to them.
+        """
+        with open(config_file, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self.__signature = (stat.st_mtime_ns, stat.st_size)
+            if not stat.st_size:
+                return self._parse_list([])  # empty file can't be mapped
+            with memory_map.mmap(f.fileno(), 0, access=memory_map.ACCESS_READ) as data:
+                tokens = self._classify_mapped(data)
+                if self.__stats is not None:
+                    tokens = self.__stats.counted(self.__stats.timed('classify', tokens))
+                errors = []
+                self._build(self._converted(tokens, errors), errors)
+
+    def _parse_dict(self, data):
+        """Used to initialize Config object data structures from dict of the same structure as to_dict() returns."""
+        def tokens(section, prefix):
+            subsections = []
+            for key, value in section.items():
+                if isinstance(value, dict):
+                    subsections.append((prefix + key, value))
+                else:
+                    yield PROPERTY, key, value
+            for name, value in subsections:
+                yield SECTION, name, None
+                yield from tokens(value, name + '.')
+
+        self._build(tokens(data, ''), [])
 
     def _parse_string(self, config_string):
         """Used to initialize Config object data structures from string"""
         config_lines = config_string.split('\n')
         self._parse_list(config_lines)
 
-    def _parse_list(self, config_list):
-        """Used to initialize Config object data structures from list"""
-        config_list = [x.strip() for x in config_list]
-        self.__dict__ = {**self.__dict__, **self._parser(config_list).__dict__}
+    def _parse_list(self, config_list, track_blocks=False):
+        """
+        Used to initialize Config object data structures from list or any other iterable of lines.
+        Lines are streamed through generator pipeline (strip, classify, convert), so input is never copied.
+        If track_blocks is set, hashes of sections' lines are recorded to find changed sections on reload.
+        """
+        lines = (x.strip() for x in config_list)
+        if track_blocks:
+            lines = self._track_blocks(lines)
+        stats = self.__stats
+        if stats is not None:
+            lines = stats.timed('read', lines)
+        tokens = self._classify(lines)
+        if stats is not None:
+            tokens = stats.counted(stats.timed('classify', tokens))
+        errors = []
+        converted = self._converted(tokens, errors)
+        if stats is not None and converted is not tokens:
+            converted = stats.timed('convert', converted)
+        self._build(converted, errors)
+
+    def _build(self, tokens, errors):
+        """Builds sections from tokens and publishes them. Splits timings of pipeline phases if stats are collected."""
+        stats = self.__stats
+        if stats is None:
+            return self._publish(self._parser(tokens, self.__sections, self.__properties, errors))
+        start = time.perf_counter()
+        root = self._parser(tokens, self.__sections, self.__properties, errors)
+        stats.split(('read', 'classify', 'convert'), 'build', time.perf_counter() - start)
+        self._publish(root)
+
+    def _is_section(self, line):
+        """Checks if stripped line is section header, the same way as _classify does."""
+        return len(line) > 1 and line[0] == '[' and line[-1] == ']' and line[0] not in self.__comment_markers
+
+    def _track_blocks(self, lines):
+        """Passes lines through, recording hashes of lines of each section (and no-section part) of config."""
+        digests = self.__digests = {}
+        section_name, block = None, []
+        comment_markers = self.__comment_markers
+        for line in lines:
+            if len(line) > 1 and line[0] == '[' and line[-1] == ']' and line[0] not in comment_markers:
+                digests[section_name] = hash(tuple(block))
+                section_name, block = line[1:-1], []
+            else:
+                block.append(line)
+            yield line
+        digests[section_name] = hash(tuple(block))
+
+    def _split_blocks(self, lines):
+        """Returns dict of section name (None for no-section part) -> list of its lines, excluding header."""
+        blocks = {None: []}
+        block = blocks[None]
+        for line in lines:
+            if self._is_section(line):
+                block = blocks[line[1:-1]] = []  # redefined section replaces previous one
+            else:
+                block.append(line)
+        return blocks
+
+    def _classify(self, lines):
+        """Turns stripped lines into (kind, key, value) tokens: COMMENT, SECTION or PROPERTY."""
+        comment_markers = self.__comment_markers
+        delimiter = self.__delimiter
+        intern = sys.intern  # property names repeat across sections, so they are stored once
+        for line in lines:
+            if len(line) < 2 or line[0] in comment_markers:
+                yield COMMENT, line, None
+            elif line[0] == '[' and line[-1] == ']':
+                yield SECTION, line[1:-1], None
+            else:
+                equator = line.find(delimiter)  # chop key:value line
+                yield PROPERTY, intern(line[:equator].strip()), line[equator + 1:].strip()
+
+    def _classify_mapped(self, data):
+        """
+        Turns lines of memory-mapped file into (kind, key, value) tokens, the same as _classify does,
+        scanning for newlines and delimiters in bytes. Keys, section names and comments are decoded,
+        values are left as bytes.
+        """
+        encoding = self.__encoding
+        comment_markers = set(self.__comment_markers.encode(encoding))
+        delimiter = self.__delimiter.encode(encoding)
+        skipped = len(self.__delimiter[:1].encode(encoding))  # value starts after first character of delimiter
+        intern = sys.intern
+        for line in iter(data.readline, b''):  # newlines are searched by mmap itself, much faster than in loop here
+            line = line.strip()
+            if len(line) < 2 or line[0] in comment_markers:
+                yield COMMENT, line.decode(encoding), None
+            elif line[0] == 0x5b and line[-1] == 0x5d:  # [section]
+                yield SECTION, line[1:-1].decode(encoding), None
+            else:
+                equator = line.find(delimiter)
+                if equator == -1:  # sliced by characters, not bytes, like _classify does
+                    yield PROPERTY, intern(line.decode(encoding)[:-1].strip()), line
+                else:
+                    yield PROPERTY, intern(line[:equator].strip().decode(encoding)), line[equator + skipped:].strip()
+
+    def _converted(self, tokens, errors, interpolated=False):
+        """
+        Resolves references in values of tokens if interpolation is enabled, unless they are interpolated already,
+        then converts values: with schema if there is one, else with converters unless config is lazy.
+        """
+        if self.__interpolation and not interpolated:
+            tokens = self._interpolate(tokens)
+        if self.__schema is not None:
+            return self._apply_schema(tokens, errors)
+        if not self.__lazy:
+            return self._convert_values(tokens)
+        return tokens
+
+    def _interpolate(self, tokens):
+        """
+        Replaces references to other properties in values of PROPERTY tokens with their texts. References may point
+        forward, so tokens are collected first. Values with references (templates) are nodes of dependency graph,
+        which is sorted topologically once, so each template is substituted once, after ones it references.
+        Graph is kept for set() to resolve again only properties depending on changed one.
+        :raise InterpolationError listing references to absent properties and circular references
+        """
+        tokens = list(tokens)
+        encoding = self.__encoding
+        values = {None: {}}  # section name -> {property name -> raw value}
+        section = values[None]
+        for kind, key, value in tokens:
+            if kind == SECTION:
+                section = values[key] = {}  # redefined section replaces previous one
+            elif kind == PROPERTY:
+                section[key] = value
+
+        templates = {}  # (section name, property name) -> value with references
+        for section_name, section in values.items():
+            for key, value in section.items():
+                if type(value) is bytes:  # raw value of memory-mapped file
+                    if b'$' not in value:
+                        continue
+                    value = value.decode(encoding)
+                if '$' in value and REFERENCE.search(value):
+                    templates[section_name, key] = value
+
+        def text_of(node):
+            value = values.get(node[0], {}).get(node[1])
+            return value.decode(encoding) if type(value) is bytes else value
+
+        references, dependents = _dependency_graph(templates)
+        resolved = _resolve_templates(templates, templates, references, text_of, {})
+        texts = {node: resolved[node] if node in resolved else text_of(node) for node in dependents}
+        self.__graph = (templates, references, dependents, texts)
+
+        section_name = None
+        for kind, key, value in tokens:
+            if kind == SECTION:
+                section_name = key
+            elif kind == PROPERTY and (section_name, key) in resolved:
+                value = resolved[section_name, key]
+            yield kind, key, value
+
+    def _reresolve(self, node, value):
+        """
+        Updates dependency graph of interpolated values for property set to value, and resolves it and properties
+        depending on it, directly or through other ones, again. Texts of the other properties are reused.
+        :return (dict of node -> resolved text, for property and its dependents; updated graph)
+        :raise InterpolationError if value references absent property or makes circular reference
+        """
+        templates, references, dependents, texts = (dict(x) for x in self.__graph)
+        for reference in references.pop(node, ()):
+            dependents[reference] = [x for x in dependents[reference] if x != node]
+            if not dependents[reference]:
+                del dependents[reference]
+                texts.pop(reference, None)
+        templates.pop(node, None)
+        if isinstance(value, str) and '$' in value and REFERENCE.search(value):
+            templates[node] = value
+            references[node] = _references(value)
+            for reference in references[node]:
+                dependents[reference] = dependents.get(reference, []) + [node]
+
+        affected = [node]  # property and its dependents, in order of breadth-first walk
+        seen = {node}
+        for x in affected:
+            for dependent in dependents.get(x, ()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    affected.append(dependent)
+
+        def text_of(x):
+            return texts[x] if x in texts else self._property_text(x)
+
+        resolved = _resolve_templates(seen, templates, references, text_of,
+                                      {} if node in templates else {node: str(value)})
+        for x in chain(resolved, references.get(node, ())):  # texts of referenced properties for later changes
+            if x in dependents:
+                texts[x] = resolved[x] if x in resolved else text_of(x)
+        return resolved, (templates, references, dependents, texts)
+
+    def _property_text(self, node):
+        """Returns text of property for interpolation into other ones, None if there is no such property."""
+        section_name, key = node
+        if section_name not in self.__properties.get(key, ()):
+            return None
+        section = self.__root if section_name is None else self._section(section_name)
+        value = self._section_items(section)[0][key]
+        if type(value) is bytes:
+            return value.decode(self.__encoding)
+        if type(value) is tuple:
+            value = value[0]  # see _apply_schema
+        return value if isinstance(value, str) else str(value)
+
+    def _apply_schema(self, tokens, errors):
+        """
+        Converts values of PROPERTY tokens declared in schema with their compiled converters, and values of other
+        properties as usual (unless config is lazy). Conversion errors are collected to errors list.
+        In lazy mode, converted values are wrapped in 1-tuples, which tells them apart from raw strings.
+        """
+        schema = self.__schema
+        encoding = self.__encoding
+        lazy = self.__lazy
+        convert = self._convert if self.__converters and not self.__lazy else None
+        section_name, fields = None, schema.get(None, {})
+        for kind, key, value in tokens:
+            if kind == SECTION:
+                section_name, fields = key, schema.get(key, {})
+            elif kind == PROPERTY:
+                converter = fields.get(key)
+                if converter is not None:
+                    try:
+                        value = converter(value.decode(encoding) if type(value) is bytes else value)
+                        if lazy:
+                            value = (value,)
+                    except (ValueError, TypeError) as e:
+                        errors.append(f'{key if section_name is None else section_name + "." + key}: {e}')
+                elif convert is not None:
+                    value = convert(value)
+            yield kind, key, value
+
+    def _convert_values(self, tokens):
+        """Converts values of PROPERTY tokens to booleans or numbers if enabled."""
+        if not self.__converters:
+            yield from tokens
+            return
+        convert = self._convert
+        for kind, key, value in tokens:
+            if kind == PROPERTY:
+                value = convert(value)
+            yield kind, key, value
 
     @staticmethod
     def _parse_numbers(value):
         """If string value can be represented as number, method will return it as int or float, else untouched."""
+        if not value or not NUMBER_CHARACTERS.issuperset(value):
+            return value
+        if INTEGER.match(value):
+            return int(value)  # exact, even if too large for float
         try:
             conv_float = float(value)
-            if conv_float - int(conv_float) == 0:
-                value = int(conv_float)
-            else:
-                value = conv_float
         except ValueError:
             return value
-        return value
+        return int(conv_float) if conv_float.is_integer() else conv_float
 
     def _parse_booleans(self, value):
         """If string value can be interpreted as boolean, method will return it as True or as False, else untouched."""
-        lowercase_value = value.lower()
-        if lowercase_value in self.__boolean_true:
-            return True
-        elif lowercase_value in self.__boolean_false:
-            return False
-        return value
+        if len(value) > self.__booleans_length:
+            return value
+        return self.__booleans.get(value.lower(), value)
 
-    def _parser(self, config):
+    def _parser(self, config, sections, properties, errors=None):
         """Factory for choosing correct parsing method for selected hierarchy style."""
-        if not self.__hierarchy:
-            return self._default_parser(config)
+        if not self.__hierarchy or self.__hierarchy == 'dotted':
+            return self._finish(self._default_parser(config, sections, properties), sections, errors)
         else:
-            raise NotImplementedError("Parsing hierarchical INI configs is not yet implemented")
+            raise NotImplementedError(f'Parsing hierarchical INI configs of type "{self.__hierarchy}" '
+                                      f'is not implemented')
 
-    def _default_parser(self, lines, section_name=None):
+    def _default_parser(self, tokens, sections, properties):
         """
         Default parser: sections' structure is flat (no hierarchy).
-        :param lines: list of lines of config file.
-        :param section_name: None if parsing no-section part of config or section name otherwise.
-        :return ConfigSection object.
+        Makes a single forward pass over tokens, so parsing time grows linearly with config size.
+        :param tokens: iterable of (kind, key, value) tokens of config file.
+        :param sections: section index to fill.
+        :param properties: property index to fill.
+        :return ConfigSection object for no-section part of config, holding sections as its properties.
+        """
+        root = {}
+        root_comments = {}
+        section, comments, section_name = root, root_comments, None
+        position = 0  # of line in section, to restore comments layout on export
+        convert = self._convert if self.__lazy else None
+
+        for kind, key, value in tokens:
+            if kind == SECTION:
+                if section is not root:  # previous section is complete, attach it to the root
+                    root[section_name] = self.__section_type(self.__exceptions, comments or None, section_name, section,
+                                                             convert)
+                section_name = key
+                if section_name in sections:  # redefined section replaces previous one
+                    self._unindex_section(section_name, root[section_name], properties)
+                sections[section_name] = True
+                section, comments, position = {}, {}, 0
+                continue
+            if kind == COMMENT:
+                comments[position] = key
+            else:
+                if key in section:  # repeated property replaces value in place, so it takes no line of its own
+                    position -= 1
+                section[key] = value
+                properties.setdefault(key, {})[section_name] = None
+            position += 1
+
+        if section is not root:
+            root[section_name] = self.__section_type(self.__exceptions, comments or None, section_name, section,
+                                                     convert)
+        return self.__section_type(self.__exceptions, root_comments or None, None, root, convert)
+
+    def _finish(self, root, sections, errors=None):
+        """
+        Completes parsed config: checks it against schema and sets defaults declared there, if there is schema,
+        and arranges sections into tree, if hierarchy is enabled.
+        :param errors: list of errors found while parsing, if there were any.
+        :raise SchemaError listing errors found while parsing and required properties absent in config
         """
-        section = {}
-        comments = []
-        is_section = lambda line: True if line.startswith('[') and line.endswith(']') else False
-        is_comment = lambda line: True if len(line) < 2 or line[0] in self.__comment_markers else False
+        if self.__schema is not None:
+            root = self._apply_defaults(root, sections, errors or [])
+        return self._arrange(root, sections) if self.__hierarchy else root
 
-        while lines:
-            line = lines.pop(0)
+    def _apply_defaults(self, root, sections, errors):
+        """
+        Checks that required properties of schema are present and sets declared defaults to sections,
+        adding sections absent in config as implicit ones. Defaults are not exported, like inherited properties.
+        In dotted hierarchy, defaults are set by _arrange.
+        :raise SchemaError if there are any errors
+        """
+        root_properties, flat_sections = self._section_items(root)
+        for section_name, (defaults, required) in self.__schema_defaults.items():
+            section = root if section_name is None else flat_sections.get(section_name)
+            present = {} if section is None else self._section_items(section)[0]
+            errors.extend(f'{key if section_name is None else section_name + "." + key}: required property is absent'
+                          for key in required if key not in present)
+        if errors:
+            raise SchemaError(errors)
 
-            if is_comment(line):
-                comments.append(line)
+        convert = self._convert if self.__lazy else None
+        argv = dict(root_properties)
+        argv.update(flat_sections)
+        for section_name, (defaults, _) in self.__schema_defaults.items():
+            if section_name is None or not defaults:
+                continue
+            section = flat_sections.get(section_name)
+            if section is None:
+                sections.setdefault(section_name, False)
+                properties, comments = {}, None
             else:
-                if is_section(line):
-                    property_key = line[1:-1]
-                    self.__sections.append(property_key)
-                    section_content = []
-                    while lines and not is_section(lines[0]):  # rip section lines and feed them to separate parser
-                        section_content.append(lines.pop(0))
-                    section[property_key] = self._default_parser(section_content, section_name=property_key)
-                else:
-                    comments.append(None)
-                    equator = line.find(self.__delimiter)  # chop key:value line
-                    property_key = line[:equator].strip()
-                    property_value = line[equator + 1:].strip()
-
-                    saved_pv = property_value
-                    if self.__parse_booleans:
-                        property_value = self._parse_booleans(property_value)
-                    if saved_pv is property_value:
-                        if self.__parse_numbers:
-                            property_value = self._parse_numbers(property_value)
-
-                    section[property_key] = property_value
-                    self.__properties.append(property_key)
-        return ConfigSection(self.__exceptions, comments, section_name, section)
+                properties, comments = dict(self._section_items(section)[0]), section._ConfigSection__comments
+            argv[section_name] = self.__section_type(self.__exceptions, comments, section_name, properties, convert,
+                                                     None if self.__hierarchy else defaults)
+        return self.__section_type(self.__exceptions, root._ConfigSection__comments, None, argv, convert,
+                                   None if self.__hierarchy else self._declared_defaults(None))
 
-    def __getattr__(self, item):
-        if not self.__exceptions:
-            return Nothing()
+    def _declared_defaults(self, section_name):
+        """Returns dict of defaults declared in schema for section, or None if there are none."""
+        if self.__schema_defaults is None or section_name not in self.__schema_defaults:
+            return None
+        return self.__schema_defaults[section_name][0] or None
+
+    def _set_schema(self, schema):
+        """Compiles schema (or unsets it, if it is None) to be applied to config when parsing it."""
+        self.__schema_fields = _schema_fields(schema) if schema is not None else None  # section -> {key -> Field}
+        # section name -> {property name -> converter}, section name -> (defaults, required property names)
+        self.__schema, self.__schema_defaults = (self._compile_schema(self.__schema_fields) if schema is not None
+                                                 else (None, None))
+
+    def _compile_schema(self, schema_fields):
+        """
+        Compiles schema once into converter functions of declared properties, so they are converted and checked
+        in the same pass as parsing, and their values need no checks later.
+        :param schema_fields: dict of section name -> {property name -> Field}.
+        :return (section name -> {property name -> converter}, section name -> (defaults, required property names))
+        """
+        converters, defaults = {}, {}
+        lazy = self.__lazy
+        for section_name, fields in schema_fields.items():
+            converters[section_name] = {key: self._compile_field(field) for key, field in fields.items()}
+            section_defaults = {key: (field.default,) if lazy else field.default  # see _apply_schema
+                                for key, field in fields.items() if field.default is not None}
+            required = tuple(key for key, field in fields.items() if field.required)
+            if section_defaults or required:
+                defaults[section_name] = (section_defaults, required)
+        return converters, defaults
+
+    def _compile_field(self, field):
+        """
+        Returns function converting string value to type of field and checking its constraints, which raises
+        ValueError (or TypeError) for invalid value. Only the checks field declares are included.
+        """
+        if field.type is bool:
+            booleans = self.__booleans
+
+            def coerce(value):  # unlike parse_booleans, anything but configured boolean words is an error
+                result = booleans.get(value.lower())
+                if result is None:
+                    raise ValueError(f'{value!r} is not a boolean')
+                return result
+        elif field.type is str:
+            coerce = None
         else:
+            coerce = field.type
+
+        checks = []
+        if field.min is not None:
+            minimum = field.min
+            checks.append((lambda x: x >= minimum, f'less than {minimum!r}'))
+        if field.max is not None:
+            maximum = field.max
+            checks.append((lambda x: x <= maximum, f'greater than {maximum!r}'))
+        if field.choices is not None:
+            choices = frozenset(field.choices)
+            checks.append((lambda x: x in choices, f'not one of {sorted(choices, key=repr)!r}'))
+        if not checks:
+            return coerce or str
+
+        def convert(value):
+            if coerce is not None:
+                value = coerce(value)
+            for check, message in checks:
+                if not check(value):
+                    raise ValueError(f'{value!r} is {message}')
+            return value
+        return convert
+
+    def _arrange(self, root, sections):
+        """
+        Arranges flat sections into tree of dotted hierarchy: section "a.b" becomes subsection "b" of section "a".
+        Tree is built once, so resolving section takes as many lookups as there are levels in its name.
+        Properties of section are inherited by its subsections as defaults, also resolved here once.
+        :param root: ConfigSection of no-section part of config, holding all sections by their full names.
+        :param sections: section index, implicit intermediate sections (absent in config) are added to it as False.
+        :return ConfigSection of no-section part of config, holding top level sections.
+        """
+        root_properties, flat_sections = self._section_items(root)
+        tree = {}  # name part -> [full section name, subtree]
+        for name in flat_sections:
+            parts = name.split('.')
+            node = tree
+            for depth in range(1, len(parts) + 1):
+                node = node.setdefault(parts[depth - 1], ['.'.join(parts[:depth]), {}])[1]
+        convert = self._convert if self.__lazy else None
+
+        def build(name, subtree, defaults):
+            section = flat_sections.get(name)
+            if section is None:
+                sections.setdefault(name, False)
+                properties, comments = {}, None
+            else:
+                properties, comments = self._section_items(section)[0], section._ConfigSection__comments
+            argv = dict(properties)
+            if subtree:
+                inherited = {**defaults, **properties}  # shared by all subsections
+                for part, (full_name, children) in subtree.items():
+                    argv[part] = build(full_name, children, inherited)
+            declared = self._declared_defaults(name)  # inherited properties take precedence over schema defaults
+            return self.__section_type(self.__exceptions, comments, name, argv, convert,
+                                       {**declared, **defaults} if declared else defaults or None)
+
+        argv = dict(root_properties)
+        for part, (full_name, children) in tree.items():
+            argv[part] = build(full_name, children, {})
+        return self.__section_type(self.__exceptions, root._ConfigSection__comments, None, argv, convert,
+                                   self._declared_defaults(None))
+
+    def _unindex_section(self, section_name, section, properties):
+        """Removes properties of section from property index."""
+        for key in self._section_items(section)[0]:
+            owners = properties.get(key)
+            if owners and section_name in owners:
+                del owners[section_name]
+                if not owners:
+                    del properties[key]
+
+    def _convert(self, value):
+        """
+        Passes property value through converters until one of them changes it.
+        Results are memoized, as the same values tend to repeat across config.
+        Bytes values (of memory-mapped file) are decoded first.
+        """
+        if type(value) is tuple:
+            return value[0]  # converted by schema at load time
+        conversions = self.__conversions
+        if value in conversions:
+            return conversions[value]
+        converted = text = value.decode(self.__encoding) if type(value) is bytes else value
+        for converter in self.__converters:
+            converted = converter(text)
+            if converted is not text:
+                break
+        if len(conversions) < CONVERSION_CACHE_SIZE:
+            conversions[value] = converted
+        return converted
+
+    def __getattr__(self, item):
+        state = self.__dict__  # the same published state is read and updated, even if reload swaps it meanwhile
+        if state.get('_Config__deferred'):
+            root = state['_Config__root']
+            values = _section_values(root)
+            if state.get('_Config__track_access'):
+                if item in values or _resolve(root, values, item) is not _MISSING:
+                    return getattr(root, item)  # access is counted by root section
+            else:
+                value = _resolve(root, values, item)
+                if value is not _MISSING:
+                    state[item] = value  # property of no-section part converted lazily, or default of schema
+                    return value
+            pending = state.get('_Config__pending')
+            if pending and item in pending:  # section of indexed file, which is parsed on first access
+                self._load_sections((item,))
+                return getattr(self, item)
+        if state.get('_Config__miss') is _section_error:  # raised here, as exception passing another frame costs more
             raise AttributeError(f'Config does not contain section "{item}"')
+        if item[:2] == '__' == item[-2:]:  # special attribute probes (by copy, pickle etc) raise AttributeError
+            raise AttributeError(f'{type(self).__name__!r} object has no attribute {item!r}')
+        return NOTHING
+
+
+class LoadError(Exception):
+    """Raised by Config.load_many when some of config files failed to load."""
+
+    def __init__(self, errors, configs):
+        """
+        :param errors: dict of path -> exception raised while loading it.
+        :param configs: dict of path -> Config object, for files which were loaded successfully.
+        """
+        self.errors = errors
+        self.configs = configs
+        super().__init__(f'Failed to load {len(errors)} config file(s): ' +
+                         '; '.join(f'{path}: {error!r}' for path, error in errors.items()))
+
+
+class SchemaError(ValueError):
+    """Raised when config does not conform to schema, listing all errors found."""
+
+    def __init__(self, errors):
+        """:param errors: list of error descriptions, each prefixed with "section.property" it is about."""
+        self.errors = errors
+        super().__init__(f'Config does not conform to schema: {len(errors)} error(s)\n' + '\n'.join(errors))
+
+
+class Changeset(object):
+    """
+    Difference between two configs, made by Config.diff() and applied by Config.apply(). Section name None stands
+    for no-section part of config, values are converted ones.
+    - added_sections: section name -> (properties, comments) of sections absent in old config, where comments
+      is dict of line position -> comment line, or None.
+    - removed_sections: section name -> list of its property names, for sections absent in new config.
+    - added: section name -> {property name -> value}, for properties absent in old section.
+    - removed: section name -> list of property names absent in new section.
+    - changed: section name -> {property name -> (old value, new value)}.
+    """
+
+    def __init__(self):
+        self.added_sections = {}
+        self.removed_sections = {}
+        self.added = {}
+        self.removed = {}
+        self.changed = {}
+
+    def __bool__(self):
+        return bool(self.added_sections or self.removed_sections or self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return (f'Changeset(sections: +{len(self.added_sections)} -{len(self.removed_sections)}, properties: '
+                f'+{sum(map(len, self.added.values()))} -{sum(map(len, self.removed.values()))} '
+                f'~{sum(map(len, self.changed.values()))})')
+
+    def keys(self):
+        """Returns set of changed keys: "section.property", or just "property" for no-section part of config."""
+        keys = set()
+        for name, section_keys in chain(((name, x[0]) for name, x in self.added_sections.items()),
+                                        self.removed_sections.items(), self.added.items(), self.removed.items(),
+                                        self.changed.items()):
+            keys.update(section_keys if name is None else (name + '.' + key for key in section_keys))
+        return keys
+
+
+class InterpolationError(ValueError):
+    """Raised when values of config reference absent properties or reference each other in circle, listing all such."""
+
+    def __init__(self, errors):
+        """:param errors: list of error descriptions, each prefixed with "section.property" it is about."""
+        self.errors = errors
+        super().__init__(f'Config references can not be resolved: {len(errors)} error(s)\n' + '\n'.join(errors))
+
+
+class Field(object):
+    """
+    Declaration of property in schema.
+    :param type: callable converting string value, like int, float or str; bool accepts only boolean words
+           configured for Config (yes, no etc by default).
+    :param default: value of property absent in config, if not None.
+    :param required: if set, absence of property is an error.
+    :param min: minimal allowed value.
+    :param max: maximal allowed value.
+    :param choices: collection of allowed values.
+    """
+    __slots__ = ('type', 'default', 'required', 'min', 'max', 'choices')
+
+    def __init__(self, type=str, default=None, required=False, min=None, max=None, choices=None):
+        self.type = type
+        self.default = default
+        self.required = required
+        self.min = min
+        self.max = max
+        self.choices = choices
+
+    def __repr__(self):
+        return 'Field(' + ', '.join(f'{x}={getattr(self, x)!r}' for x in self.__slots__) + ')'
+
+
+def _schema_fields(schema):
+    """
+    Turns schema into dict of section name -> {property name -> Field}. Schema is either mapping of section name
+    -> {property name -> Field or type}, or class, where annotated attributes are properties (required ones,
+    unless they have default value), Field attributes are properties too, and nested classes are sections.
+    """
+    if isinstance(schema, type):
+        return _class_fields(schema, None, {})
+    return {section_name: {key: x if isinstance(x, Field) else Field(x) for key, x in fields.items()}
+            for section_name, fields in schema.items()}
+
+
+def _class_fields(schema, section_name, fields):
+    """Collects fields of schema class into fields dict, section names of nested classes are dotted."""
+    section = fields.setdefault(section_name, {})
+    attributes = vars(schema)
+    annotations = typing.get_type_hints(schema) if '__annotations__' in attributes else {}
+    for name, value in attributes.items():
+        if name.startswith('_'):
+            continue
+        if isinstance(value, Field):
+            section[name] = value
+        elif isinstance(value, type) and name not in annotations:
+            _class_fields(value, name if section_name is None else section_name + '.' + name, fields)
+    for name, annotation in annotations.items():
+        if name.startswith('_') or name in section or name not in attributes.get('__annotations__', {}):
+            continue
+        section[name] = Field(annotation, default=attributes[name]) if name in attributes \
+            else Field(annotation, required=True)
+    return fields
+
+
+def _shift_comments(comments, keys, removed):
+    """
+    Returns comments of section with positions shifted over lines of removed properties, so they stay next to
+    the same lines. Lines of section are comments at their positions and properties in between.
+    :param comments: dict of line position -> comment line, or None.
+    :param keys: property names of section in order.
+    :param removed: set of names of removed properties.
+    """
+    if not comments:
+        return comments
+    shifted = {}
+    key_iterator = iter(keys)
+    removed_lines = 0
+    for position in range(len(comments) + len(keys)):
+        if position in comments:
+            shifted[position - removed_lines] = comments[position]
+        elif next(key_iterator) in removed:
+            removed_lines += 1
+    return shifted
+
+
+def _glob_index(names):
+    """Returns index of names for _glob: tuple of names sorted and of reversed names sorted."""
+    return sorted(names), sorted(name[::-1] for name in names)
+
+
+def _glob(index, pattern):
+    """
+    Returns list of names of index (see _glob_index) matching glob pattern. Candidates are narrowed by binary search
+    for longer one of literal prefix (in sorted names) and literal suffix (in sorted reversed names) of pattern.
+    """
+    names, reversed_names = index
+    wildcards = [match.start() for match in GLOB_SPECIAL.finditer(pattern)]
+    if not wildcards:
+        position = bisect.bisect_left(names, pattern)
+        return [pattern] if position < len(names) and names[position] == pattern else []
+    prefix, suffix = pattern[:wildcards[0]], pattern[wildcards[-1] + 1:]
+    if len(prefix) >= len(suffix):
+        candidates = _prefixed(names, prefix)
+    else:
+        candidates = [name[::-1] for name in _prefixed(reversed_names, suffix[::-1])]
+    return [name for name in candidates if fnmatchcase(name, pattern)]
+
+
+def _prefixed(names, prefix):
+    """Returns slice of sorted names starting with prefix (and following names, if prefix ends with U+10FFFF)."""
+    if not prefix:
+        return names
+    start = bisect.bisect_left(names, prefix)
+    if prefix[-1] == chr(sys.maxunicode):  # no character follows the last one, so the rest is left to the caller
+        return names[start:]
+    return names[start:bisect.bisect_left(names, prefix[:-1] + chr(ord(prefix[-1]) + 1), start)]
+
+
+def _references(template):
+    """Returns tuple of (section name, property name) nodes referenced by template, without repeats."""
+    nodes = {}
+    for match in REFERENCE.finditer(template):
+        name = match.group(1)
+        if name is not None:
+            section_name, _, key = name.rpartition('.')
+            nodes[section_name or None, key] = None
+    return tuple(nodes)
+
+
+def _dependency_graph(templates):
+    """
+    Returns dependency graph of templates (dict of node -> value with references): dict of node -> nodes
+    it references, and dict of node -> nodes referencing it.
+    """
+    references, dependents = {}, {}
+    for node, template in templates.items():
+        references[node] = _references(template)
+        for reference in references[node]:
+            dependents.setdefault(reference, []).append(node)
+    return references, dependents
+
+
+def _resolve_templates(nodes, templates, references, text_of, resolved):
+    """
+    Substitutes references in templates of nodes in topological order of dependency graph (Kahn's algorithm),
+    so each template is substituted once, after templates it references.
+    :param nodes: collection of nodes to resolve, references to nodes outside of it are resolved already.
+    :param text_of: function returning text of property outside of nodes, None if there is no such property.
+    :param resolved: dict of node -> text to fill, may already hold texts of nodes without templates.
+    :return resolved
+    :raise InterpolationError listing references to absent properties and nodes which can't be ordered because of
+           circular references
+    """
+    blocking = {}  # node -> number of its references not resolved yet
+    waiting = {}  # node -> nodes referencing it
+    for node in nodes:
+        node_references = [x for x in references.get(node, ()) if x in nodes]
+        blocking[node] = len(node_references)
+        for reference in node_references:
+            waiting.setdefault(reference, []).append(node)
+    order = [node for node, count in blocking.items() if not count]
+    for node in order:  # list grows while it is iterated
+        for dependent in waiting.get(node, ()):
+            blocking[dependent] -= 1
+            if not blocking[dependent]:
+                order.append(dependent)
+
+    def name(node):
+        return node[1] if node[0] is None else node[0] + '.' + node[1]
+
+    def replace(match):
+        if match.group(1) is None:
+            return '$'
+        section_name, _, key = match.group(1).rpartition('.')
+        node = (section_name or None, key)
+        text = resolved[node] if node in resolved else text_of(node)
+        if text is None:
+            raise KeyError(match.group(0))
+        return text
+
+    errors = []
+    for node in order:
+        if node in templates:
+            try:
+                resolved[node] = REFERENCE.sub(replace, templates[node])
+            except KeyError as e:
+                errors.append(f'{name(node)}: reference to absent property {e.args[0]}')
+    errors.extend(f'{name(node)}: circular reference' for node, count in blocking.items() if count)
+    if errors:
+        raise InterpolationError(errors)
+    return resolved
+
+
+def _load(cls, path, options):
+    """Loads config file, returning (config, None), or (None, exception) if it failed to load."""
+    try:
+        return cls(path, **options), None
+    except Exception as e:
+        return None, e
+
+
+class Stats(object):
+    """
+    Instrumentation data collected by Config object, if stats option is set:
+    - timings: phase -> seconds, for the last load: read (reading and stripping lines), classify (telling comments,
+      sections and properties apart), convert (resolving references and converting values), build (building sections
+      and indexes), total (including everything else, like reading cache). Reading memory-mapped file is a part
+      of classify phase. The last reload which changed something is timed as reload.
+    - counts: number of lines, comments (including blank lines), sections and properties, for the last load.
+    - conversions: converter name -> [number of calls, seconds spent in it], since config was created.
+    - access: "section.property" (or "property" for no-section part of config) -> number of accesses,
+      if track_access option is set. Accesses to sections are counted under their names.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.counts = {}
+        self.conversions = {}
+        self.access = {}
+
+    def report(self, callback):
+        """Passes itself to callback, if there is one."""
+        if callback is not None:
+            callback(self)
+
+    def timed(self, phase, iterable):
+        """Passes items of iterable through, adding time spent producing them to timings[phase]."""
+        clock = time.perf_counter
+        iterator = iter(iterable)
+        end = object()
+        elapsed = 0.0
+        while True:
+            start = clock()
+            item = next(iterator, end)
+            elapsed += clock() - start
+            if item is end:
+                break
+            yield item
+        self.timings[phase] = self.timings.get(phase, 0.0) + elapsed
+
+    def counted(self, tokens):
+        """Passes (kind, key, value) tokens through, counting them by kind."""
+        kinds = [0, 0, 0]  # COMMENT, SECTION, PROPERTY
+        for token in tokens:
+            kinds[token[0]] += 1
+            yield token
+        self.counts.update(lines=sum(kinds), comments=kinds[COMMENT], sections=kinds[SECTION],
+                           properties=kinds[PROPERTY])
+
+    def split(self, phases, outer, total):
+        """
+        Turns timings of nested generator phases (innermost first), each including time of inner ones,
+        into time spent in each phase alone. What is left of total time of outer phase is assigned to it.
+        """
+        timings = self.timings
+        inner = 0.0
+        for phase in phases:
+            if phase in timings:
+                inclusive = timings[phase]
+                timings[phase] = inclusive - inner
+                inner = inclusive
+        timings[outer] = total - inner
+
+    def count_access(self, section_name, item):
+        """Counts access to property of section (None for no-section part of config)."""
+        key = item if section_name is None else section_name + '.' + item
+        self.access[key] = self.access.get(key, 0) + 1
+
+    def timed_converter(self, converter):
+        """Returns wrapper of converter, counting its calls and time spent in it."""
+        name = getattr(converter, '__name__', repr(converter))
+        conversions = self.conversions
+        clock = time.perf_counter
+
+        @wraps(converter)
+        def timed(value):
+            start = clock()
+            result = converter(value)
+            record = conversions.setdefault(name, [0, 0.0])
+            record[0] += 1
+            record[1] += clock() - start
+            return result
+        return timed
+
+
+def _counting_section(stats):
+    """Returns ConfigSection subclass, which counts accesses to its properties in Stats object."""
+
+    class CountingSection(ConfigSection):
+        __slots__ = ()
+
+        def __getattribute__(self, item):
+            if item in _SECTION_ATTRIBUTES:
+                return _getattribute(self, item)
+            values = _section_values(self)
+            value = values[item] if item in values else _resolve(self, values, item)
+            if value is _MISSING:
+                return _getattribute(self, item)  # raises AttributeError, so __getattr__ handles miss, not counted
+            stats.count_access(_section_name(self), item)
+            return value
+
+    return CountingSection
 
 
 class Singleton(type):
@@ -324,20 +2396,149 @@ class Nothing(object, metaclass=Singleton):
         return self
 
 
+NOTHING = Nothing()  # the only instance, returned for absent sections without calling metaclass every time
+
+
 class ConfigSection(object):
-    """Data container object"""
-    def __init__(self, exceptions, comments, section_name, argv):
-        self.__exceptions = exceptions
-        self.__name = section_name
-        self.__comments = comments
-        for key, value in argv.items():
-            self.__dict__[key] = value
+    """
+    Read-only data container object, so it can be shared between threads without locking.
+    Metadata is kept in slots, properties (and subsections) in instance __dict__ in file order, so reading them
+    is a regular attribute lookup, and comments in sparse dict of their positions among section lines.
+    Properties inherited from parent section in dotted hierarchy are kept apart as defaults, so they are not exported.
+    If convert function is passed, string values are kept aside as raw ones and converted on first access,
+    then converted value is cached in place. Digest of properties is memoized in place by Config.diff as well,
+    both mutations being idempotent.
+    """
+    __slots__ = ('__dict__', '__miss', '__name', '__comments', '__values', '__raw', '__convert', '__defaults',
+                 '__digest')
+
+    def __init__(self, exceptions, comments, section_name, argv, convert=None, defaults=None):
+        """
+        :param exceptions: if set, accessing nonexistent property will raise AttributeError.
+        :param comments: dict of comment line position in section -> comment line, None if there are no comments.
+        :param section_name: None for no-section part of config.
+        :param argv: dict of properties (and subsections), section takes ownership of it.
+        :param convert: if passed, properties are converted with this function on first access.
+        :param defaults: dict of properties inherited from parent section, None if there are none.
+        """
+        if convert is None:
+            values, raw = argv, None
+        else:
+            values, raw = {}, {}
+            for key, value in argv.items():
+                if isinstance(value, ConfigSection):
+                    values[key] = value
+                else:
+                    raw[key] = value
+        init = object.__setattr__  # section is read-only, so slots are set bypassing __setattr__
+        if raw is None and defaults is None:
+            miss = _property_error if exceptions else _property_none
+        else:
+            miss = _resolved_error if exceptions else _resolved_none
+        init(self, '_ConfigSection__miss', miss)
+        init(self, '_ConfigSection__name', section_name)
+        init(self, '_ConfigSection__comments', comments)
+        init(self, '__dict__', values)
+        init(self, '_ConfigSection__values', values)  # the same dict, read by slot getter without attribute lookup
+        init(self, '_ConfigSection__raw', raw)
+        init(self, '_ConfigSection__convert', convert)
+        init(self, '_ConfigSection__defaults', defaults)
+        init(self, '_ConfigSection__digest', None)
 
     def __iter__(self):
-        yield from self.__dict__
+        if self.__raw is None:
+            yield from self.__values
+        else:
+            yield from self.__raw
+            yield from (k for k, v in self.__values.items() if isinstance(v, ConfigSection))
 
     def __getattr__(self, item):
-        if not self.__exceptions:
+        # properties are found in instance __dict__ by regular lookup, so only lazy and inherited ones and misses
+        # get here, to handler chosen once for section; slots shadow properties
+        miss = self.__miss
+        if miss is _property_error:  # the most common misses are handled without another call
+            raise AttributeError(f'Section "{self.__name}" does not contain property "{item}"')
+        if miss is _property_none and item[:2] != '__':
             return None
+        return miss(self, item)
+
+    def __reduce__(self):
+        """Pickles (and copies) section as standalone one, with all values converted."""
+        values, raw, convert = self.__values, self.__raw, self.__convert
+        defaults = self.__defaults
+        if raw is not None:
+            argv = {key: values[key] if key in values else convert(value) for key, value in raw.items()}
+            argv.update((key, value) for key, value in values.items() if isinstance(value, ConfigSection))
+            if defaults:
+                defaults = {key: convert(value) for key, value in defaults.items()}
         else:
-            raise AttributeError(f'Section "{self.__name}" does not contain property "{item}"')
+            argv = dict(values)
+        exceptions = self.__miss in (_property_error, _resolved_error)
+        return ConfigSection, (exceptions, self.__comments, self.__name, argv, None, defaults)
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f'Section "{self.__name}" is read-only')
+
+    def __delattr__(self, item):
+        raise AttributeError(f'Section "{self.__name}" is read-only')
+
+
+_SECTION_ATTRIBUTES = frozenset(dir(ConfigSection))  # slots and methods, looked up regularly
+_MISSING = object()  # marks absent property
+_getattribute = object.__getattribute__
+# slot getters, reading slots directly without attribute lookup, which finds properties first
+_section_name = ConfigSection._ConfigSection__name.__get__
+_section_values = ConfigSection._ConfigSection__values.__get__
+_section_raw = ConfigSection._ConfigSection__raw.__get__
+_section_convert = ConfigSection._ConfigSection__convert.__get__
+_section_defaults = ConfigSection._ConfigSection__defaults.__get__
+_section_digest = ConfigSection._ConfigSection__digest.__get__
+_memoize_digest = ConfigSection._ConfigSection__digest.__set__
+
+
+def _resolve(section, values, item):
+    """
+    Looks up property absent in values of section: raw (lazy) one, converting and caching it,
+    or inherited default. Returns _MISSING if there is no such property.
+    """
+    raw = _section_raw(section)
+    if raw and item in raw:
+        value = values[item] = _section_convert(section)(raw[item])
+        return value
+    defaults = _section_defaults(section)
+    if defaults and item in defaults:
+        if raw is None:
+            return defaults[item]
+        value = values[item] = _section_convert(section)(defaults[item])
+        return value
+    return _MISSING
+
+
+# handlers of access to nonexistent property of section or section of config, chosen once by exceptions option,
+# and for section by whether it has lazy or inherited properties, which are looked up first
+def _property_none(section, item):
+    if item[:2] == '__' == item[-2:]:  # special attribute probes (by copy, pickle etc) raise AttributeError
+        raise AttributeError(f'{type(section).__name__!r} object has no attribute {item!r}')
+    return None
+
+
+def _property_error(section, item):
+    raise AttributeError(f'Section "{_section_name(section)}" does not contain property "{item}"')
+
+
+def _resolved_none(section, item):
+    value = _resolve(section, _section_values(section), item)
+    return _property_none(section, item) if value is _MISSING else value
+
+
+def _resolved_error(section, item):
+    value = _resolve(section, _section_values(section), item)
+    return _property_error(section, item) if value is _MISSING else value
+
+
+def _section_nothing(item):
+    return NOTHING
+
+
+def _section_error(item):
+    raise AttributeError(f'Config does not contain section "{item}"')
@@ -122,3 +122,28 @@ def exceptions(request):
             'truth = lie'
         ], exceptions=request.param
     )
+
+
+dotted_input = [
+    'name = app',
+    '[db]',
+    'timeout = 5',
+    'host = localhost',
+    '[db.primary.pool]',
+    '; pool of primary database',
+    'size = 10',
+    '[cache]',
+    'ttl = 60',
+    '[db.replica]',
+    'host = replica',
+]
+
+
+@pytest.fixture()
+def dotted_list():
+    return dotted_input
+
+
+@pytest.fixture(params=[False, True])
+def dotted_config(request):
+    return liteconfig.Config(dotted_input, hierarchy='dotted', lazy=request.param)
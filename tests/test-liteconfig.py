@@ -1,4 +1,12 @@
+import asyncio
+import copy
+import hashlib
+import io
+import json
 import os
+import pickle
+import threading
+import time
 import liteconfig
 import pytest
 
@@ -29,10 +37,37 @@ def test_dot_notation(common_configs):
     assert not common_configs.void.nonexistent.etcetera
 
 
+def test_sections_with(common_configs):
+    assert common_configs.sections_with('pi') == ['misc']
+    assert common_configs.sections_with('property') == [None]
+    assert common_configs.sections_with('properti') == []
+
+
+def test_property_index():
+    cfg = liteconfig.Config(['[a]', 'x = 1', 'y = 2', '[b]', 'x = 3', 'x = 4', '[a]', 'y = 5'])
+    assert cfg.sections_with('x') == ['b']
+    assert cfg.sections_with('y') == ['a']
+    assert cfg.has_property('x', 'b')
+    assert not cfg.has_property('x', 'a')
+    assert cfg.b.x == 4
+
+
 def test_unicode(common_configs):
     assert common_configs.юникод.文字 == '😉'
 
 
+def test_streaming_input(config_list):
+    with open('tests/fixtures/test.ini', 'r', encoding='utf-8') as f:
+        text_stream = liteconfig.Config(f)
+    with open('tests/fixtures/test.ini', 'rb') as f:
+        binary_stream = liteconfig.Config(f)
+    generator = liteconfig.Config(line for line in config_list)
+    for cfg in (text_stream, binary_stream, generator):
+        assert cfg.misc.pi == 3.14159
+        assert cfg.юникод.文字 == '😉'
+        assert list(cfg._Config__sections) == ['section', 'misc', 'юникод']
+
+
 def test_file_not_found():
     with pytest.raises(FileNotFoundError):
         _ = liteconfig.Config('nonexistent.ini')
@@ -43,6 +78,52 @@ def test_not_implemented():
         _ = liteconfig.Config(['hierarchy = test'], hierarchy=1)
 
 
+def test_dotted_hierarchy(dotted_config):
+    assert dotted_config.name == 'app'
+    assert dotted_config.db.primary.pool.size == 10
+    assert dotted_config.db.replica.host == 'replica'
+    assert dotted_config.cache.ttl == 60
+    assert not dotted_config.db.primary.pool.nonexistent
+    assert dotted_config.has_section('db.primary.pool')
+    assert dotted_config.has_section('db.primary')
+    assert not dotted_config.has_section('db.pool')
+    assert dotted_config.sections_with('host') == ['db', 'db.replica']
+
+
+def test_dotted_inheritance(dotted_config):
+    assert dotted_config.db.replica.timeout == 5
+    assert dotted_config.db.primary.host == 'localhost'
+    assert dotted_config.db.primary.pool.timeout == 5
+    assert not dotted_config.cache.timeout
+    assert list(dotted_config.db.replica) == ['host']
+    assert not dotted_config.has_property('timeout', 'db.replica')
+
+
+def test_dotted_write(dotted_config, dotted_list):
+    dotted_config.write('tests/fixtures/out.ini')
+    with open('tests/fixtures/out.ini', 'r', encoding='utf-8') as f:
+        exported = f.read().split('\n')
+    os.remove('tests/fixtures/out.ini')
+    assert exported == dotted_list
+
+
+def test_dotted_reload(tmp_path, dotted_list):
+    config_file = str(tmp_path / 'config.ini')
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(dotted_list))
+    cfg = liteconfig.Config(config_file, hierarchy='dotted', cache=True)
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(dotted_list).replace('timeout = 5', 'timeout = 7'))
+    os.utime(config_file, ns=(0, os.stat(config_file).st_mtime_ns + 1))
+    assert cfg.reload() == {'db.timeout'}
+    assert cfg.db.replica.timeout == 7
+    assert cfg.db.primary.pool.size == 10
+    for _ in range(2):  # parsing, then loading from cache
+        cached = liteconfig.Config(config_file, hierarchy='dotted', cache=True)
+        assert cached.db.primary.pool.timeout == 7
+        assert cached.has_section('db.primary') and not cached.has_property('timeout', 'db.primary')
+
+
 def test_invalid_input():
     with pytest.raises(ValueError):
         _ = liteconfig.Config(14)
@@ -67,6 +148,14 @@ def test_write(simple_config):
     assert simple_config.partition.second == test_read.partition.second, 2
 
 
+def test_write_duplicate_keys():
+    liteconfig.Config(['a = 1', 'a = 2', '; comment', '[s]', 'b = 1', '; x', 'b = 2']).write('tests/fixtures/out.ini')
+    with open('tests/fixtures/out.ini', 'r', encoding='utf-8') as f:
+        exported = f.read().split('\n')
+    os.remove('tests/fixtures/out.ini')
+    assert exported == ['a = 2', '; comment', '[s]', 'b = 2', '; x']
+
+
 def test_write_with_comments(comments_list):
     liteconfig.Config(comments_list).write('tests/fixtures/out.ini')
     with open('tests/fixtures/out.ini', 'r', encoding='utf-8') as f:
@@ -75,6 +164,833 @@ def test_write_with_comments(comments_list):
     assert config_with_comments == comments_list
 
 
+def test_cache(tmp_path, comments_list, monkeypatch):
+    config_file = str(tmp_path / 'config.ini')
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(comments_list))
+    for lazy in (False, True):
+        cache_dir = str(tmp_path / f'cache{lazy}')
+        liteconfig.Config(config_file, cache=cache_dir, lazy=lazy)
+        assert len(os.listdir(cache_dir)) == 1
+        with monkeypatch.context() as m:
+            m.setattr(liteconfig.Config, '_parse_list', None)  # cache hit must not run parser
+            cfg = liteconfig.Config(config_file, cache=cache_dir, lazy=lazy)
+        assert cfg.section.nokia == 3310
+        assert cfg.юникод.文字 == '😉'
+        assert cfg.has_property('pi', 'misc')
+        cfg.write(str(tmp_path / 'out.ini'))
+        with open(str(tmp_path / 'out.ini'), 'r', encoding='utf-8') as f:
+            assert f.read().split('\n') == comments_list
+
+
+def test_cache_invalidation(tmp_path):
+    config_file = str(tmp_path / 'config.ini')
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('value = 1\n')
+    assert liteconfig.Config(config_file, cache=True).value == 1
+    assert os.path.exists(config_file + '.cache')
+    stat = os.stat(config_file)
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('value = 2\n')
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))  # same size and time, other content
+    assert liteconfig.Config(config_file, cache=True).value == 2
+    assert liteconfig.Config(config_file, cache=True, parse_numbers=False).value == '2'
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_index(tmp_path, comments_list, lazy):
+    config_file = str(tmp_path / 'config.ini')
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(comments_list + ['  [misc]  ', 'pi = 3.14', '[last]']))
+    full = liteconfig.Config(config_file, lazy=lazy)
+    cfg = liteconfig.Config(config_file, index=True, lazy=lazy)
+    assert cfg.property == 'value'
+    assert cfg.has_section('юникод') and cfg.has_section('last') and not cfg.has_section('nonexistent')
+    assert list(cfg._Config__sections) == list(full._Config__sections)
+    assert cfg._Config__pending == {'section', 'misc', 'юникод', 'last'}  # sections are not parsed yet
+    assert cfg.has_property('property') and len(cfg._Config__pending) == 4  # found in index without parsing
+    assert cfg.section.nokia == 3310
+    assert cfg._Config__pending == {'misc', 'юникод', 'last'}
+    assert cfg.get('misc', 'pi') == 3.14  # redefined section replaces previous one
+    assert cfg.has_property('文字', 'юникод') and cfg.last is not None
+    assert not cfg._Config__pending
+    assert cfg.to_dict() == full.to_dict()
+    assert cfg.sections_with('pi') == ['misc']
+    assert not cfg.nonexistent
+    streams = io.StringIO(), io.StringIO()
+    cfg.write(streams[0])
+    full.write(streams[1])
+    assert streams[0].getvalue() == streams[1].getvalue()
+
+    assert liteconfig.Config(config_file, index=True, hierarchy='dotted').misc.pi == 3.14  # ignored option
+    cfg = liteconfig.Config(config_file, index=True)
+    assert cfg.sections_with('heads') == ['section']  # property index covers all sections then
+    cfg = liteconfig.Config(config_file, index=True)
+    os.remove(config_file)
+    assert cfg.has_section('misc')  # answered without reading file
+    with pytest.raises(FileNotFoundError):
+        _ = cfg.misc
+
+
+def test_index_cache(tmp_path, comments_list, monkeypatch):
+    config_file = str(tmp_path / 'config.ini')
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(comments_list))
+    liteconfig.Config(config_file, index=True, cache=True)
+    assert os.path.exists(config_file + '.index') and not os.path.exists(config_file + '.cache')
+    with monkeypatch.context() as m:
+        m.setattr(liteconfig.Config, '_scan_sections', None)  # offsets are read from sidecar index
+        cfg = liteconfig.Config(config_file, index=True, cache=True)
+        assert cfg.misc.pi == 3.14159
+    with open(config_file, 'a', encoding='utf-8') as f:
+        f.write('\n[new]\nvalue = 1')
+    assert liteconfig.Config(config_file, index=True, cache=True).new.value == 1
+
+
+def test_index_reload(tmp_path):
+    config_file = str(tmp_path / 'config.ini')
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('value = 1\n[a]\nx = 1\n[b]\nx = 1\n[c]\nx = 1\n')
+    cfg = liteconfig.Config(config_file, index=True)
+    assert cfg.a.x == 1
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('value = 2\n[a]\nx = 22\n[b]\nx = 2\n[d]\nx = 2\n')
+    os.utime(config_file, ns=(0, os.stat(config_file).st_mtime_ns + 1))
+    assert cfg.reload() == {'value', 'a.x'}  # sections which were not accessed yet are not compared
+    assert cfg.a.x == 22 and cfg.b.x == 2 and cfg.d.x == 2
+    assert not cfg.has_section('c')
+
+    cfg = liteconfig.Config(config_file, index=True)
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('[b]\nx = 3\n')
+    os.utime(config_file, ns=(0, os.stat(config_file).st_mtime_ns + 1))
+    assert cfg.b.x == 3  # outdated offsets are not used, config is reloaded first
+    assert not cfg.has_section('a')
+
+
+def test_shadowed_methods(tmp_path):
+    config_file = str(tmp_path / 'config.ini')
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('reload = 1\nwrite = 1\nunwatch = 1\nareload = 1\nget = 1\n[a]\nx = 1\n[b]\nx = 1\n')
+    cfg = liteconfig.Config(config_file, index=True)
+    assert cfg.reload == 1 and cfg.a.x == 1  # properties shadow methods, which config calls on its own
+    with open(config_file, 'a', encoding='utf-8') as f:
+        f.write('y = 2\n')
+    os.utime(config_file, ns=(0, os.stat(config_file).st_mtime_ns + 1))
+    assert cfg.b.y == 2
+
+    async def main():
+        stream = io.StringIO()
+        await liteconfig.Config.awrite(cfg, stream)
+        return await liteconfig.Config.areload(cfg), stream.getvalue()
+
+    changes, text = run(main())
+    assert changes == set() and text.endswith('[b]\nx = 1\ny = 2')
+    liteconfig.Config.watch(cfg, interval=0.01)
+    liteconfig.Config.unwatch(cfg)
+
+
+def test_reload(tmp_path, comments_list):
+    config_file = str(tmp_path / 'config.ini')
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(comments_list))
+    cfg = liteconfig.Config(config_file)
+    section, misc = cfg.section, cfg.misc
+    assert cfg.reload() == set()
+
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(comments_list).replace('nokia = 3310', 'nokia = 6310').replace('[юникод]', '[new]'))
+    os.utime(config_file, ns=(0, os.stat(config_file).st_mtime_ns + 1))
+    assert cfg.reload() == {'section.nokia', 'юникод.文字', 'new.文字'}
+    assert cfg.section.nokia == 6310
+    assert cfg.section is not section
+    assert cfg.misc is misc  # unchanged section is not parsed again
+    assert cfg.has_section('new') and not cfg.has_section('юникод')
+    assert cfg.sections_with('文字') == ['new']
+    assert not cfg.юникод
+
+
+@pytest.mark.parametrize('interpolation', [False, True])
+def test_reload_after_set(tmp_path, interpolation):
+    config_file = str(tmp_path / 'config.ini')
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('[s]\na = 1\n[u]\nb = 2')
+    cfg = liteconfig.Config(config_file, interpolation=interpolation)
+    cfg.set('s', 'a', '9')
+    cfg.apply(cfg.diff(liteconfig.Config(['[s]', 'a = 9'])))  # removes section u
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('[s]\na = 1\n[u]\nb = 2\n[t]\nq = 3')
+    os.utime(config_file, ns=(0, os.stat(config_file).st_mtime_ns + 1))
+    assert cfg.reload() == {'s.a', 'u.b', 't.q'}  # sections changed in memory are parsed from file again
+    assert cfg.s.a == 1 and cfg.u.b == 2 and cfg.t.q == 3
+
+
+def test_reload_not_file(config_list):
+    with pytest.raises(ValueError):
+        liteconfig.Config(config_list).reload()
+
+
+def test_watch(tmp_path):
+    config_file = str(tmp_path / 'config.ini')
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('[section]\nvalue = 1\n')
+    cfg = liteconfig.Config(config_file)
+    changed = threading.Event()
+    cfg.watch(lambda changes: changes == {'section.value'} and changed.set(), interval=0.01)
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('[section]\nvalue = 22\n')
+    assert changed.wait(5)
+    cfg.unwatch()
+    assert cfg.section.value == 22
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_concurrent_reload(tmp_path, lazy):
+    config_file = str(tmp_path / 'config.ini')
+
+    def write_version(version):
+        with open(config_file, 'w', encoding='utf-8') as f:
+            f.write(f'version = {version}\n[a]\nx = {version}\ny = {version}\n[b]\nx = {version}\n')
+        os.utime(config_file, ns=(0, version))
+
+    write_version(0)
+    cfg = liteconfig.Config(config_file, lazy=lazy)
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            section = cfg.a
+            snapshot = cfg.snapshot()
+            if section.x != section.y or not snapshot.version == snapshot.a.y == snapshot.b.x:
+                errors.append((section.x, section.y, snapshot.version, snapshot.a.y, snapshot.b.x))
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for version in range(1, 30):
+        write_version(version)
+        assert cfg.reload() == {'version', 'a.x', 'a.y', 'b.x'}
+    stop.set()
+    for reader in readers:
+        reader.join()
+    assert not errors
+    assert cfg.a.x == cfg.b.x == 29
+
+
+def test_read_only_section(simple_config):
+    with pytest.raises(AttributeError):
+        simple_config.section.first = 2
+    with pytest.raises(AttributeError):
+        del simple_config.section.first
+    assert simple_config.section.first == 1
+
+
+def test_write_stream(comments_list):
+    text = io.StringIO()
+    liteconfig.Config(comments_list).write(text)
+    assert text.getvalue() == '\n'.join(comments_list)
+    binary = io.BytesIO()
+    liteconfig.Config(['[раздел]', 'вопрос = ответ'], encoding='koi8_r').write(binary)
+    assert binary.getvalue() == '[раздел]\nвопрос = ответ'.encode('koi8_r')
+
+
+def test_write_atomic(tmp_path):
+    class Broken:
+        def __str__(self):
+            raise RuntimeError('export failed')
+
+    def break_value(value):
+        return Broken() if value == 'broken' else value
+
+    config_file = str(tmp_path / 'config.ini')
+    liteconfig.Config(['value = 1']).write(config_file)
+    with pytest.raises(RuntimeError):
+        liteconfig.Config(['value = 2', 'other = broken'], converters=[break_value]).write(config_file)
+    with open(config_file, 'r', encoding='utf-8') as f:
+        assert f.read() == 'value = 1'
+    assert os.listdir(str(tmp_path)) == ['config.ini']
+
+
+def test_layered(tmp_path):
+    base, host = str(tmp_path / 'base.ini'), str(tmp_path / 'host.ini')
+    with open(base, 'w', encoding='utf-8') as f:
+        f.write('name = app\n[db]\nhost = localhost\nport = 5432\n[log]\nlevel = info\n')
+    with open(host, 'w', encoding='utf-8') as f:
+        f.write('[db]\nhost = db.local\n')
+    cfg = liteconfig.Config.layered([base, ['[log]', 'level = debug'], host], workers=2)
+    assert cfg.name == 'app'
+    assert cfg.db.host == 'db.local'
+    assert cfg.db.port == 5432
+    assert cfg.log.level == 'debug'
+    assert cfg.provenance('host', 'db') == host
+    assert cfg.provenance('port', 'db') == base
+    assert cfg.provenance('level', 'log') == 1
+    assert cfg.provenance('name') == base
+    assert cfg.provenance('nonexistent', 'db') is None
+    assert cfg.sections_with('host') == ['db']
+    assert cfg.has_section('log')
+
+
+def test_layered_dotted(dotted_list):
+    cfg = liteconfig.Config.layered([dotted_list, ['[db]', 'timeout = 9']], hierarchy='dotted', lazy=True)
+    assert cfg.db.primary.pool.timeout == 9
+    assert cfg.db.primary.pool.size == 10
+
+
+@pytest.mark.parametrize('processes', [False, True])
+def test_load_many(tmp_path, processes):
+    for i in range(20):
+        with open(tmp_path / f'tenant{i:02}.ini', 'w', encoding='utf-8') as f:
+            f.write(f'; tenant {i}\nid = {i}\n[db]\nname = tenant{i}\n')
+    configs = liteconfig.Config.load_many(str(tmp_path / '*.ini'), workers=2, processes=processes)
+    assert list(configs) == sorted(str(x) for x in tmp_path.glob('*.ini'))
+    config = configs[str(tmp_path / 'tenant07.ini')]
+    assert config.id == 7
+    assert config.db.name == 'tenant7'
+    assert config.sections_with('name') == ['db']
+    assert config.reload() == set()
+
+
+@pytest.mark.parametrize('processes', [False, True])
+def test_load_many_errors(tmp_path, processes):
+    good = str(tmp_path / 'good.ini')
+    with open(good, 'w', encoding='utf-8') as f:
+        f.write('a = 1')
+    missing = str(tmp_path / 'missing.ini')
+    with pytest.raises(liteconfig.LoadError) as e:
+        liteconfig.Config.load_many([missing, good], processes=processes)
+    assert list(e.value.errors) == [missing]
+    assert isinstance(e.value.errors[missing], FileNotFoundError)
+    assert e.value.configs[good].a == 1
+    assert missing in str(e.value)
+
+
+def test_mmap(tmp_path):
+    path = str(tmp_path / 'big.ini')
+    text = '; header\nname = Мир\n[section]\nnumber = 42\nflag = on\n\n; ok\npath = /a=b\r\n[empty]\n'
+    with open(path, 'w', encoding='koi8-r', newline='') as f:
+        f.write(text)
+    cfg = liteconfig.Config(path, mmap=True, encoding='koi8-r')
+    usual = liteconfig.Config(path, encoding='koi8-r')
+    assert cfg.name == 'Мир'
+    assert cfg.section.number == 42
+    assert cfg.section.flag is True
+    assert cfg.section.path == '/a=b'
+    assert cfg.sections_with('number') == ['section']
+    assert cfg.has_section('empty')
+    assert list(cfg._export()) == list(usual._export())
+
+    with open(path, 'w', encoding='koi8-r') as f:
+        f.write(text.replace('42', '43'))
+    os.utime(path, ns=(1, 1))
+    assert cfg.reload() == {'section.number'}
+    assert cfg.section.number == 43
+
+
+def test_mmap_delimiter(tmp_path):
+    path = str(tmp_path / 'config.ini')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('a := 1\n[s]\nб := значение\nc = 3\n')
+    for delimiter in ':=', '=', '§:':
+        cfg = liteconfig.Config(path, mmap=True, delimiter=delimiter)
+        assert cfg.to_dict() == liteconfig.Config(path, delimiter=delimiter).to_dict()  # sliced like text lines
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+        assert cfg.reload() == set()
+
+
+def test_mmap_empty(tmp_path):
+    path = tmp_path / 'empty.ini'
+    path.write_bytes(b'')
+    cfg = liteconfig.Config(str(path), mmap=True)
+    assert not cfg.has_section('anything')
+
+
+def run(coroutine):
+    """Runs coroutine in new event loop, like asyncio.run, which is absent in Python 3.6."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_aload_stall(tmp_path):
+    path = str(tmp_path / 'large.ini')
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(30000):
+            f.write(f'[section{i}]\n; comment\nindex = {i}\nname = section{i}\n')
+
+    async def main():
+        stalls, loading = [], True
+
+        async def ticker():
+            while loading:
+                before = time.perf_counter()
+                await asyncio.sleep(0.001)
+                stalls.append(time.perf_counter() - before)
+
+        tick = asyncio.ensure_future(ticker())
+        await asyncio.sleep(0)
+        start = time.perf_counter()
+        cfg = await liteconfig.Config.aload(path, lazy=True)
+        elapsed = time.perf_counter() - start
+        loading = False
+        await tick
+        return cfg, elapsed, stalls
+
+    cfg, elapsed, stalls = run(main())
+    assert cfg.section29999.index == 29999
+    assert len(stalls) > 5  # loop kept running while config was loading
+    assert max(stalls) < max(0.1, elapsed / 3)
+
+
+def test_async_changes(tmp_path):
+    path = str(tmp_path / 'config.ini')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[section]\nvalue = 1\nother = 2')
+
+    async def main():
+        cfg = await liteconfig.Config.aload(path)
+        changes = cfg.changes(interval=0.01)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('[section]\nvalue = 2\nother = 2')
+        os.utime(path, ns=(1, 1))
+        changed = await asyncio.wait_for(changes.__anext__(), 5)
+        await changes.aclose()
+        assert await cfg.areload() == set()
+        stream = io.StringIO()
+        await cfg.awrite(stream)
+        return cfg, changed, stream.getvalue()
+
+    cfg, changed, text = run(main())
+    assert changed == {'section.value'}
+    assert cfg.section.value == 2
+    assert text == '[section]\nvalue = 2\nother = 2'
+
+    with pytest.raises(ValueError):
+        run(liteconfig.Config(['a = 1']).changes().__anext__())
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_stats(lazy):
+    reports = []
+    cfg = liteconfig.Config(['; comment', 'a = 1', '[section]', 'b = yes', 'c = text', '', 'd = 2'],
+                            lazy=lazy, stats=reports.append)
+    stats = cfg.stats()
+    assert reports == [stats]
+    assert stats.counts == {'lines': 7, 'comments': 2, 'sections': 1, 'properties': 4}
+    assert set(stats.timings) == {'read', 'classify', 'build', 'total'} | (set() if lazy else {'convert'})
+    assert all(x >= 0 for x in stats.timings.values())
+    assert stats.access == {}
+    assert cfg.section.b is True
+    assert stats.conversions['_parse_booleans'][0] == (1 if lazy else 4)
+    assert liteconfig.Config(['a = 1']).stats() is None
+
+
+def test_track_access():
+    cfg = liteconfig.Config(['a = 1', 'b = 2', '[section]', 'c = 3', 'd = 4'], track_access=True)
+    for _ in range(3):
+        assert cfg.a == 1
+        assert cfg.section.c == 3
+    assert cfg.nonexistent is liteconfig.liteconfig.NOTHING
+    assert cfg.stats().access == {'a': 3, 'section': 3, 'section.c': 3}
+    assert cfg.get('section', 'd') == 4
+    assert cfg.stats().access == {'a': 3, 'section': 3, 'section.c': 3, 'section.d': 1}
+    assert cfg.section.typo is None and cfg.get('section', 'typo') is None and cfg.get(None, 'typo') is None
+    assert cfg.stats().access == {'a': 3, 'section': 4, 'section.c': 3, 'section.d': 1}  # misses are not counted
+    assert cfg.has_property('d', 'section')
+    assert cfg.write(io.StringIO()) is None
+    assert cfg.stats().access == {'a': 3, 'section': 4, 'section.c': 3, 'section.d': 1}
+
+
+def test_stats_reload(tmp_path):
+    path = str(tmp_path / 'config.ini')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('a = 1')
+    reports = []
+    cfg = liteconfig.Config(path, stats=reports.append, mmap=True)
+    assert set(cfg.stats().timings) == {'classify', 'build', 'total'}
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('a = 2')
+    os.utime(path, ns=(1, 1))
+    assert cfg.reload() == {'a'}
+    assert 'reload' in cfg.stats().timings
+    assert len(reports) == 2
+
+
+SCHEMA = {
+    None: {'name': str, 'debug': liteconfig.Field(bool, default=False)},
+    'db': {
+        'host': liteconfig.Field(str, required=True),
+        'port': liteconfig.Field(int, default=5432, min=1, max=65535),
+        'password': str,
+    },
+    'log': {'level': liteconfig.Field(str, default='info', choices=('debug', 'info', 'error'))},
+}
+
+
+class Schema:
+    name: str
+    debug: bool = False
+
+    class db:
+        host: str
+        port = liteconfig.Field(int, default=5432, min=1, max=65535)
+        password: str = None
+
+    class log:
+        level = liteconfig.Field(str, default='info', choices=('debug', 'info', 'error'))
+
+
+@pytest.mark.parametrize('schema', [SCHEMA, Schema])
+@pytest.mark.parametrize('lazy', [False, True])
+def test_schema(schema, lazy):
+    cfg = liteconfig.Config(['name = 42', '[db]', 'host = localhost', 'password = 1234', 'timeout = 30'],
+                            schema=schema, lazy=lazy)
+    assert cfg.name == '42'
+    assert cfg.debug is False
+    assert cfg.db.host == 'localhost'
+    assert cfg.db.port == 5432
+    assert cfg.db.password == '1234'
+    assert cfg.db.timeout == 30  # not declared, converted as usual
+    assert cfg.log.level == 'info'
+    assert cfg.get('log', 'level') == 'info'
+    stream = io.StringIO()
+    cfg.write(stream)
+    assert stream.getvalue() == 'name = 42\n[db]\nhost = localhost\npassword = 1234\ntimeout = 30'
+
+
+@pytest.mark.parametrize('schema', [SCHEMA, Schema])
+def test_schema_errors(schema):
+    with pytest.raises(liteconfig.SchemaError) as e:
+        liteconfig.Config(['debug = maybe', '[db]', 'port = 0', '[log]', 'level = trace'], schema=schema)
+    errors = e.value.errors
+    assert errors[:3] == ["debug: 'maybe' is not a boolean", 'db.port: 0 is less than 1',
+                          "log.level: 'trace' is not one of ['debug', 'error', 'info']"]
+    assert 'db.host: required property is absent' in errors
+    assert isinstance(e.value, ValueError)
+    assert len(errors) == (5 if schema is Schema else 4)  # name is required in class schema
+
+
+def test_schema_dotted():
+    schema = {
+        'db': {'port': liteconfig.Field(int, default=1)},
+        'db.replica': {'port': liteconfig.Field(int, default=2)},
+        'cache': {'size': liteconfig.Field(int, default=3)},
+    }
+    cfg = liteconfig.Config(['[db]', 'host = a', '[db.primary]', 'port = 5'], schema=schema, hierarchy='dotted')
+    assert cfg.db.port == 1
+    assert cfg.db.primary.port == 5
+    assert cfg.db.replica.port == 2
+    assert cfg.db.replica.host == 'a'
+    assert cfg.cache.size == 3
+
+
+def test_schema_reload(tmp_path):
+    path = str(tmp_path / 'config.ini')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[db]\nhost = a\nport = 1')
+    cfg = liteconfig.Config(path, schema=SCHEMA)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[db]\nhost = a\nport = -1')
+    os.utime(path, ns=(1, 1))
+    with pytest.raises(liteconfig.SchemaError):
+        cfg.reload()
+    assert cfg.db.port == 1
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[db]\nhost = b')
+    os.utime(path, ns=(2, 2))
+    assert cfg.reload() == {'db.host', 'db.port'}
+    assert cfg.db.port == 5432
+    assert cfg.log.level == 'info'
+
+
+def test_schema_layered():
+    cfg = liteconfig.Config.layered([['[db]', 'host = a', 'port = 1'], ['[db]', 'port = 2']], schema=SCHEMA)
+    assert cfg.db.port == 2
+    assert cfg.db.host == 'a'
+    assert cfg.log.level == 'info'
+
+
+def test_to_dict(dotted_config):
+    cfg = liteconfig.Config(['a = 1', '[section]', 'b = yes', '; comment', 'c = text', '[empty]'])
+    assert cfg.to_dict() == {'a': 1, 'section': {'b': True, 'c': 'text'}, 'empty': {}}
+    assert json.loads(json.dumps(cfg.to_dict())) == cfg.to_dict()
+    assert dotted_config.to_dict()['db']['primary']['pool']['size'] == 10
+
+
+@pytest.mark.parametrize('hierarchy', [None, 'dotted'])
+def test_from_dict(hierarchy):
+    data = {'a': 1, 'db': {'host': 'yes', 'primary': {'port': 5}}}
+    cfg = liteconfig.Config.from_dict(data, hierarchy=hierarchy, lazy=True)
+    assert cfg.a == 1
+    assert cfg.db.host == 'yes'  # not converted
+    if hierarchy:
+        assert cfg.to_dict() == data
+        assert cfg.db.primary.port == 5
+        assert cfg.db.primary.host == 'yes'
+    else:
+        assert cfg.to_dict() == {'a': 1, 'db': {'host': 'yes'}, 'db.primary': {'port': 5}}
+    assert cfg.has_property('port', 'db.primary')
+    schema = {'db': {'user': liteconfig.Field(default='root')}, 'log': {'level': liteconfig.Field(required=True)}}
+    with pytest.raises(liteconfig.SchemaError):
+        liteconfig.Config.from_dict(data, schema=schema)
+    cfg = liteconfig.Config.from_dict({**data, 'log': {'level': 'info'}}, schema=schema)
+    assert cfg.db.user == 'root'
+
+
+@pytest.mark.parametrize('options', [{}, {'lazy': True}, {'hierarchy': 'dotted'}, {'exceptions': True},
+                                     {'schema': {'db': {'port': liteconfig.Field(int, default=1)}}},
+                                     {'stats': lambda stats: None, 'track_access': True}])
+def test_pickle(dotted_list, options):
+    cfg = liteconfig.Config(dotted_list, **options)
+    restored = pickle.loads(pickle.dumps(cfg))
+    assert restored.to_dict() == cfg.to_dict()
+    assert list(restored._export()) == list(cfg._export())
+    assert restored.sections_with('size') == cfg.sections_with('size')
+    assert restored.get('db', 'port') == cfg.get('db', 'port')
+    assert copy.copy(cfg).to_dict() == cfg.to_dict()
+    assert copy.deepcopy(cfg).to_dict() == cfg.to_dict()
+    assert not hasattr(cfg, '__deepcopy__')
+    if options.get('exceptions'):
+        with pytest.raises(AttributeError):
+            _ = restored.nonexistent
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_pickle_section(dotted_list, lazy):
+    cfg = liteconfig.Config(dotted_list, hierarchy='dotted', lazy=lazy)
+    section = pickle.loads(pickle.dumps(cfg.db.primary))
+    assert list(section) == list(cfg.db.primary)
+    assert section.pool.size == cfg.db.primary.pool.size
+    assert section.pool.timeout == cfg.db.primary.pool.timeout
+    assert copy.deepcopy(cfg.db).primary.pool.size == cfg.db.primary.pool.size
+    assert section.nonexistent is None
+
+
+INTERPOLATED = [
+    'base = /srv',
+    '[paths]',
+    'data = ${base}/data',
+    'logs = ${paths.data}/logs',
+    'url = http://${server.host}:${server.port}/',
+    '[server]',
+    'host = example.com',
+    'port = 8080',
+    'backup_port = ${server.port}',
+    'price = $$5',
+]
+
+
+@pytest.mark.parametrize('options', [{}, {'lazy': True}, {'hierarchy': 'dotted'}, {'mmap': True}, {'cache': True}])
+def test_interpolation(tmp_path, options):
+    config_file = str(tmp_path / 'config.ini')
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(INTERPOLATED))
+    for _ in range(2):  # the second load of cached config is restored from cache
+        cfg = liteconfig.Config(config_file, interpolation=True, **options)
+        assert cfg.paths.logs == '/srv/data/logs'
+        assert cfg.paths.url == 'http://example.com:8080/'  # forward references
+        assert cfg.server.backup_port == 8080  # converted after substitution
+        assert cfg.server.price == '$5'
+        stream = io.StringIO()
+        cfg.write(stream)
+        assert stream.getvalue() == '\n'.join(INTERPOLATED)  # references are exported as written
+    assert liteconfig.Config(INTERPOLATED).paths.data == '${base}/data'
+
+
+def test_interpolation_errors():
+    with pytest.raises(liteconfig.InterpolationError) as e:
+        liteconfig.Config(['a = ${b}', 'b = ${a}', 'c = ${c}', 'd = ${nothing.here}', 'e = ${d}'], interpolation=True)
+    assert e.value.errors == ['d: reference to absent property ${nothing.here}',
+                              'a: circular reference', 'b: circular reference', 'c: circular reference']
+    assert isinstance(e.value, ValueError)
+
+
+@pytest.mark.parametrize('options', [{}, {'lazy': True}, {'hierarchy': 'dotted'}])
+def test_set(options):
+    cfg = liteconfig.Config(INTERPOLATED, interpolation=True, **options)
+    server = cfg.server
+    assert cfg.set('server', 'port', '9090') == {'server.port', 'server.backup_port', 'paths.url'}
+    assert cfg.server.backup_port == 9090
+    assert cfg.paths.url == 'http://example.com:9090/'
+    assert server.port == 8080  # sections are not changed in place
+    assert cfg.set(None, 'base', '/opt') == {'base', 'paths.data', 'paths.logs'}
+    assert cfg.paths.logs == '/opt/data/logs'
+    assert cfg.set('server', 'host', '${base}.example.com') == {'server.host', 'paths.url'}
+    assert cfg.paths.url == 'http:///opt.example.com:9090/'
+    assert cfg.set('server', 'host', 'example.com') == {'server.host', 'paths.url'}
+    assert cfg.set('server', 'port', 9090) == set()
+    assert cfg.set('server', 'port', 7070) == {'server.port', 'server.backup_port', 'paths.url'}
+    assert cfg.paths.url == 'http://example.com:7070/'
+
+    with pytest.raises(liteconfig.InterpolationError):
+        cfg.set('server', 'host', '${paths.url}')
+    with pytest.raises(liteconfig.InterpolationError):
+        cfg.set('server', 'host', '${server.name}')
+    assert cfg.server.host == 'example.com'  # config is not changed by failed set()
+
+    assert cfg.set('client', 'server', '${paths.url}') == {'client.server'}
+    assert cfg.has_section('client') and cfg.sections_with('server') == ['client']
+    assert cfg.set('server', 'port', '6060') == {'server.port', 'server.backup_port', 'paths.url', 'client.server'}
+    assert cfg.client.server == 'http://example.com:6060/'
+    restored = pickle.loads(pickle.dumps(cfg))
+    assert restored.set(None, 'base', '/srv') == {'base', 'paths.data', 'paths.logs'}
+    assert restored.paths.logs == '/srv/data/logs'
+
+
+def test_set_options():
+    cfg = liteconfig.Config(['[section]', 'value = 1', 'text = ${value}'])
+    assert cfg.set('section', 'value', 'yes') == {'section.value'}
+    assert cfg.section.value is True
+    assert cfg.set('section', 'text', '${other}') == {'section.text'}
+    assert cfg.section.text == '${other}'
+    cfg = liteconfig.Config(['[section]', 'number = 1'], schema={'section': {'number': liteconfig.Field(int, max=5)}},
+                            interpolation=True)
+    assert cfg.set('section', 'number', '3') == {'section.number'}
+    assert cfg.section.number == 3
+    with pytest.raises(liteconfig.SchemaError):
+        cfg.set('section', 'number', '6')
+    assert cfg.section.number == 3
+
+
+def test_interpolation_reload(tmp_path):
+    config_file = str(tmp_path / 'config.ini')
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(INTERPOLATED))
+    cfg = liteconfig.Config(config_file, interpolation=True)
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(INTERPOLATED).replace('/srv', '/opt'))
+    os.utime(config_file, ns=(0, os.stat(config_file).st_mtime_ns + 1))
+    assert cfg.reload() == {'base', 'paths.data', 'paths.logs'}
+    assert cfg.paths.logs == '/opt/data/logs'
+    assert cfg.set('server', 'host', 'example.org') == {'server.host', 'paths.url'}
+
+
+def test_interpolation_layered():
+    cfg = liteconfig.Config.layered([INTERPOLATED, ['[server]', 'host = example.org']], interpolation=True)
+    assert cfg.paths.url == 'http://example.org:8080/'
+
+
+OLD_CONFIG = ['; top', 'a = 1', 'b = 2', '[s]', '; c0', 'x = 1', '; c1', 'y = 2', '; c2', 'z = 3', '; c3',
+              '[s.t]', 'k = v', '[gone]', 'q = 1']
+NEW_CONFIG = ['; top', 'a = 1', 'b = yes', 'c = 3', '[s]', '; c0', 'x = 1', '; c1', '; c2', 'z = 4', '; c3', 'w = 5',
+              '[s.t]', 'k = v', '[new]', '; hello', 'n = 1']
+
+
+@pytest.mark.parametrize('options', [{}, {'lazy': True}, {'hierarchy': 'dotted'}])
+def test_diff(options):
+    old, new = liteconfig.Config(OLD_CONFIG, **options), liteconfig.Config(NEW_CONFIG)
+    changeset = old.diff(new)
+    assert changeset.added_sections == {'new': ({'n': 1}, {0: '; hello'})}
+    assert changeset.removed_sections == {'gone': ['q']}
+    assert changeset.added == {None: {'c': 3}, 's': {'w': 5}}
+    assert changeset.removed == {'s': ['y']}
+    assert changeset.changed == {None: {'b': (2, True)}, 's': {'z': (3, 4)}}
+    assert changeset.keys() == {'b', 'c', 's.w', 's.y', 's.z', 'gone.q', 'new.n'}
+    assert not new.diff(liteconfig.Config(NEW_CONFIG, **options))
+    assert not liteconfig.Config(['a = 1']).diff(liteconfig.Config(['a = 1']))
+    assert liteconfig.Config(['a = 1']).diff(liteconfig.Config(['a = yes'])).changed == {None: {'a': (1, True)}}
+    for x, y in (-1, -2), (0, 2 ** 61 - 1):  # hash(-1) == hash(-2), hash(0) == hash(2 ** 61 - 1)
+        assert liteconfig.Config(['[s]', f'x = {x}']).diff(liteconfig.Config(['[s]', f'x = {y}'])).changed == {
+            's': {'x': (x, y)}}
+
+    section = old.s
+    assert old.apply(changeset) == changeset.keys()
+    assert not old.diff(new)
+    assert old.to_dict() == liteconfig.Config(NEW_CONFIG, **options).to_dict()
+    assert section.y == 2  # sections are not changed in place
+    assert old.sections_with('q') == [] and old.sections_with('n') == ['new'] and not old.has_section('gone')
+    stream = io.StringIO()
+    old.write(stream)
+    assert stream.getvalue() == '\n'.join(NEW_CONFIG).replace('yes', 'True')  # comments are kept in place
+
+    repeated = liteconfig.Config(['[s]', 'a = 1', '; a', 'a = 2', 'b = 3', '; c'], **options)
+    assert repeated.apply(repeated.diff(liteconfig.Config(['[s]', 'a = 2']))) == {'s.b'}
+    stream = io.StringIO()
+    repeated.write(stream)
+    assert stream.getvalue() == '[s]\na = 2\n; a\n; c'  # repeated property takes place of the first one
+
+
+def test_diff_reload(tmp_path, monkeypatch):
+    config_file = str(tmp_path / 'config.ini')
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(f'[section{i}]\nvalue = {i}' for i in range(100)))
+    cfg = liteconfig.Config(config_file)
+    snapshot = cfg.snapshot()
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(f'[section{i}]\nvalue = {i + (i == 50)}' for i in range(100)))
+    os.utime(config_file, ns=(0, os.stat(config_file).st_mtime_ns + 1))
+    cfg.reload()
+    compared = []
+    original = liteconfig.Config._section_properties
+    monkeypatch.setattr(liteconfig.Config, '_section_properties',
+                        lambda self, section: compared.append(section) or original(self, section))
+    assert snapshot.diff(cfg).keys() == {'section50.value'}
+    assert compared == [snapshot.section50, cfg.section50]  # only changed section is compared property by property
+    digested, blake2b = [], hashlib.blake2b
+    monkeypatch.setattr(hashlib, 'blake2b', lambda data, **kwargs: digested.append(data) or blake2b(data, **kwargs))
+    assert snapshot.diff(cfg).keys() == {'section50.value'}
+    assert not digested  # digests are memoized
+    assert cfg.diff(cfg.snapshot()).keys() == set()
+
+
+def test_apply_interpolated():
+    cfg = liteconfig.Config(INTERPOLATED, interpolation=True)
+    changed = liteconfig.Config(INTERPOLATED, interpolation=True)
+    changed.set('server', 'port', '9090')
+    assert cfg.apply(cfg.diff(changed)) == {'server.port', 'server.backup_port', 'paths.url'}
+    assert cfg.paths.url == 'http://example.com:9090/'
+    assert cfg.set('server', 'host', 'example.org') == {'server.host'}  # applied values are final
+    assert cfg.set('server', 'port', '7070') == {'server.port'}
+
+
+QUERIED = ['a_timeout = 1', 'x = 2', '[db.main]', 'read_timeout = 3', 'host = h', 'write_timeout = 4',
+           '[db.replica]', 'read_timeout = 5', '[web]', 'read_timeout = 6', 'host = w']
+
+
+@pytest.mark.parametrize('options', [{}, {'lazy': True}, {'hierarchy': 'dotted'}])
+def test_query(options):
+    cfg = liteconfig.Config(QUERIED, **options)
+    assert cfg.query('db.*', '*_timeout') == [('db.main', 'read_timeout', 3), ('db.main', 'write_timeout', 4),
+                                                ('db.replica', 'read_timeout', 5)]
+    assert cfg.query(None) == [(None, 'a_timeout', 1), (None, 'x', 2)]
+    assert cfg.query(key_pattern='host') == [('db.main', 'host', 'h'), ('web', 'host', 'w')]
+    assert cfg.query('[!d]*', 'r?ad_*') == [('web', 'read_timeout', 6)]
+    assert cfg.query('web') == [('web', 'host', 'w'), ('web', 'read_timeout', 6)]  # sorted by key
+    assert cfg.query('*', 'nonexistent') == cfg.query('nonexistent') == cfg.query('db', '*') == []
+    result = cfg.query('db.*', '*_timeout')
+    result.clear()  # result is a copy of cached one
+    assert len(cfg.query('db.*', '*_timeout')) == 3
+    assert cfg._Config__query.cache_info().hits == 2
+    assert liteconfig.Config(['get = 0', '[get]', 'a = 1']).query() == [('get', 'a', 1)]  # shadowed method
+    top = liteconfig.Config(['[a\U0010ffff]', 'x\U0010ffff = 1', '[a\U0010ffffb]', 'x = 2', '[b]', 'x = 3'])
+    assert top.query('a\U0010ffff*') == [('a\U0010ffff', 'x\U0010ffff', 1), ('a\U0010ffffb', 'x', 2)]
+    assert top.query('a*', '\U0010ffff*') == []  # key prefix ends with U+10FFFF too
+    assert top.query(key_pattern='x\U0010ffff*') == [('a\U0010ffff', 'x\U0010ffff', 1)]
+
+
+def test_query_invalidation(tmp_path):
+    config_file = str(tmp_path / 'config.ini')
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(QUERIED))
+    cfg = liteconfig.Config(config_file, index=True)
+    assert cfg.query('db.*', 'host') == [('db.main', 'host', 'h')]
+    assert cfg._Config__pending == {'web'}  # only matching sections are parsed
+    assert cfg.query('*', 'host') == [('db.main', 'host', 'h'), ('web', 'host', 'w')]
+    snapshot = cfg.snapshot()
+    assert cfg.set('web', 'host', 'example.com') == {'web.host'}
+    assert cfg.query('web', 'host') == [('web', 'host', 'example.com')]
+    assert snapshot.query('web', 'host') == [('web', 'host', 'w')]  # snapshot keeps its state and cache
+    with open(config_file, 'a', encoding='utf-8') as f:
+        f.write('\n[cache]\nhost = c')
+    os.utime(config_file, ns=(0, os.stat(config_file).st_mtime_ns + 1))
+    cfg.reload()
+    assert cfg.query('c*', 'ho*') == [('cache', 'host', 'c')]
+    assert cfg.query(key_pattern='*st') == [('db.main', 'host', 'h'), ('web', 'host', 'w'), ('cache', 'host', 'c')]
+
+
 def test_delimiter(delimiter_configs):
     assert delimiter_configs.property == 'is here'
 
@@ -94,6 +1010,53 @@ def test_parsing_numbers(parse_numbers):
         assert parse_numbers.pi == '3.14'
 
 
+def test_parsing_numbers_exact():
+    cfg = liteconfig.Config(['big = 123456789012345678901234567890', 'under = 1_000', 'exp = 1e3',
+                             'neg = -2.5', 'inf = inf', 'version = 1.2.3', 'dash = -'])
+    assert cfg.big == 123456789012345678901234567890
+    assert cfg.under == 1000
+    assert cfg.exp == 1000 and isinstance(cfg.exp, int)
+    assert cfg.neg == -2.5
+    assert cfg.inf == 'inf'
+    assert cfg.version == '1.2.3'
+    assert cfg.dash == '-'
+
+
+def test_converters():
+    def parse_list(value):
+        return tuple(value.split(',')) if ',' in value else value
+
+    cfg = liteconfig.Config(['hosts = a,b', 'port = 80', 'flag = YES', 'again = a,b'],
+                            converters=[parse_list], boolean_true=('Yes',))
+    assert cfg.hosts == ('a', 'b')
+    assert cfg.port == 80
+    assert cfg.flag is True
+    assert cfg.again is cfg.hosts  # repeated values are converted once
+
+
+def test_lazy(config_list):
+    cfg = liteconfig.Config(config_list, lazy=True)
+    assert 'pi' not in cfg.misc._ConfigSection__values
+    assert cfg.misc.pi == 3.14159
+    assert cfg.misc._ConfigSection__values['pi'] == 3.14159
+    assert cfg.misc.kill_all_humans is True
+    assert cfg.section.nokia == 3310
+    assert cfg.property == 'value'
+    assert cfg.юникод.文字 == '😉'
+    assert not cfg.misc.nonexistent
+    assert cfg.has_property('heads', 'section')
+
+
+def test_lazy_write(comments_list):
+    cfg = liteconfig.Config(comments_list, lazy=True)
+    assert cfg.section.nokia == 3310
+    cfg.write('tests/fixtures/out.ini')
+    with open('tests/fixtures/out.ini', 'r', encoding='utf-8') as f:
+        config_with_comments = f.read().split('\n')
+    os.remove('tests/fixtures/out.ini')
+    assert config_with_comments == comments_list
+
+
 def test_parsing_booleans(parse_booleans):
     if parse_booleans._Config__parse_booleans:
         assert parse_booleans.a
@@ -120,6 +1083,45 @@ def test_encodings(encodings):
         assert not encodings.чПРТПУ
 
 
+@pytest.mark.parametrize('encoding', ['utf-8', 'utf-8-sig', 'utf-16', 'utf-32', 'koi8_r'])
+def test_encoding_auto(tmp_path, encoding):
+    config_file = str(tmp_path / 'config.ini')
+    with open(config_file, 'w', encoding=encoding) as f:
+        f.write('; комментарий\nproperty = value\n[section]\nheads = tails\n[юникод]\nключ = значение')
+    with open(config_file, 'rb') as f:
+        data = f.read()
+    for options in ({}, {'cache': True}, {'cache': True}):  # the last one is loaded from cache
+        cfg = liteconfig.Config(config_file, encoding='auto', fallback_encodings=('koi8_r',), **options)
+        assert cfg.section.heads == 'tails'
+        assert cfg._Config__encoding == encoding
+        cfg.write(str(tmp_path / 'out.ini'))
+        with open(str(tmp_path / 'out.ini'), 'rb') as f:
+            assert f.read() == data  # written back in detected encoding
+    cfg = liteconfig.Config(io.BytesIO(data), encoding='auto', fallback_encodings=('koi8_r',))
+    assert cfg.has_section('юникод')
+    assert pickle.loads(pickle.dumps(cfg))._Config__encoding == encoding
+
+
+def test_encoding_auto_fallback(tmp_path):
+    cfg = liteconfig.Config('tests/fixtures/koi8-r.ini', encoding='auto')
+    assert cfg._Config__encoding == 'latin-1'  # the default fallback decodes anything
+    cfg = liteconfig.Config('tests/fixtures/koi8-r.ini', encoding='auto',
+                            fallback_encodings=('ascii', 'koi8_r', 'cp1251'))
+    assert cfg.бНОПНЯ == 'Вопрос'
+    with pytest.raises(UnicodeError):
+        liteconfig.Config('tests/fixtures/koi8-r.ini', encoding='auto', fallback_encodings=('ascii',))
+
+    config_file = str(tmp_path / 'config.ini')
+    with open(config_file, 'w', encoding='cp1251') as f:
+        f.write('[section]\nvalue = значение\n')
+    cfg = liteconfig.Config(config_file, encoding='auto', fallback_encodings=('cp1251',))
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('[section]\nvalue = другое\n')
+    os.utime(config_file, ns=(0, os.stat(config_file).st_mtime_ns + 1))
+    assert cfg.reload() == {'section.value'}  # encoding is detected again
+    assert cfg.section.value == 'другое' and cfg._Config__encoding == 'utf-8'
+
+
 def test_exceptions(exceptions):
     if exceptions._Config__exceptions:
         with pytest.raises(AttributeError):
@@ -136,3 +1138,38 @@ def test_exceptions(exceptions):
         assert not exceptions.section.void
         assert exceptions.stray
         assert exceptions.section.truth
+        assert exceptions.void is liteconfig.liteconfig.NOTHING is liteconfig.liteconfig.Nothing()
+
+
+@pytest.mark.parametrize('options', [{}, {'lazy': True}, {'exceptions': True}, {'track_access': True}])
+def test_get(options):
+    cfg = liteconfig.Config(['a = 1', '[section]', 'b = yes', '__weird__ = 2'], **options)
+    assert cfg.get(None, 'a') == 1
+    assert cfg.get('section', 'b') is True
+    assert cfg.get('section', 'missing') is None
+    assert cfg.get('section', 'missing', 'default') == 'default'
+    assert cfg.get('void', 'b', 0) == 0
+    assert cfg.get(None, 'missing', 0) == 0
+    assert cfg.section.__weird__ == 2
+    with pytest.raises(AttributeError):
+        _ = cfg.section.__missing__
+
+
+def test_get_dotted(dotted_config):
+    assert dotted_config.get('db.primary.pool', 'size') == dotted_config.db.primary.pool.size
+    assert dotted_config.get('db.primary', 'pool') is dotted_config.db.primary.pool
+    assert dotted_config.get('db.nonexistent', 'size', -1) == -1
+
+
+def test_large_config():
+    lines = []
+    for i in range(2000):
+        lines += [f'[section{i}]', '; comment', f'index = {i}', f'name = section{i}']
+    cfg = liteconfig.Config(lines)
+    assert len(cfg._Config__sections) == 2000
+    assert len(cfg._Config__properties) == 2
+    assert len(cfg.sections_with('index')) == 2000
+    assert cfg.section0.index == 0
+    assert cfg.section1999.name == 'section1999'
+    assert cfg.section1999._ConfigSection__comments == {0: '; comment'}
+    assert list(cfg.section1999) == ['index', 'name']